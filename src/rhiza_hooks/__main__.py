@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Run any rhiza hook from a single command.
+
+Usage:
+  python -m rhiza_hooks <hook> [hook arguments...]
+
+The hook module is imported only when selected, so running one hook does not
+pay for the imports of the others.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from importlib import import_module
+
+# Subcommand name to the module providing that hook's main()
+HOOK_MODULES = {
+    "workflow-names": "rhiza_hooks.check_workflow_names",
+    "readme-help": "rhiza_hooks.update_readme_help",
+    "rhiza-config": "rhiza_hooks.check_rhiza_config",
+    "makefile-targets": "rhiza_hooks.check_makefile_targets",
+    "python-version": "rhiza_hooks.check_python_version",
+    "template-bundles": "rhiza_hooks.check_template_bundles",
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Dispatch to the selected hook's main function."""
+    parser = argparse.ArgumentParser(prog="rhiza-hooks", description="Run a rhiza pre-commit hook")
+    parser.add_argument(
+        "hook",
+        choices=HOOK_MODULES,
+        help="Hook to run",
+    )
+    parser.add_argument(
+        "args",
+        nargs=argparse.REMAINDER,
+        help="Arguments passed through to the hook",
+    )
+    args = parser.parse_args(argv)
+
+    hook_main = import_module(HOOK_MODULES[args.hook]).main
+    return hook_main(args.args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Small JSON caches shared by the hooks.
+
+Caches live under the user cache directory so hooks never leave files in
+the repository being checked. Every failure to read or write a cache is
+swallowed: a missing cache only costs the work it would have saved.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+# Environment variable overriding where hook caches are stored
+CACHE_DIR_ENV = "RHIZA_HOOKS_CACHE_DIR"
+
+# Most entries a per-file cache keeps; the oldest are dropped beyond this
+MAX_ENTRIES = 256
+
+
+def cache_dir() -> Path:
+    """Return the directory holding rhiza-hooks caches."""
+    directory = os.environ.get(CACHE_DIR_ENV)
+    if not directory:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        directory = os.path.join(base, "rhiza-hooks")
+    return Path(directory)
+
+
+@cache
+def _source_digest(checker: str) -> str:
+    """Return a short digest of the hook module at ``checker``."""
+    import hashlib
+
+    try:
+        source = Path(checker).read_bytes()
+    except OSError:
+        return ""
+    return hashlib.blake2b(source, digest_size=8).hexdigest()
+
+
+def file_stamp(path: str | os.PathLike[str], checker: str) -> list[Any] | None:
+    """Identify a file's current contents and the hook code that checked it.
+
+    The stamp is the file's mtime and size plus a digest of ``checker``,
+    the hook module's ``__file__``. Results recorded by any other version
+    of the hook therefore never match.
+
+    Returns None if the file cannot be stat'ed, so it is never cached.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size, _source_digest(checker)]
+
+
+def prune_entries(entries: dict[str, Any]) -> dict[str, Any]:
+    """Drop entries for paths that no longer exist, keeping the newest ``MAX_ENTRIES``."""
+    recent = list(entries.items())[-MAX_ENTRIES:]
+    return {path: entry for path, entry in recent if os.path.exists(path)}
+
+
+def load_json(path: Path) -> dict[str, Any]:
+    """Load a JSON object, treating a missing or corrupt file as empty."""
+    import json
+
+    try:
+        with path.open("rb") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_json(path: Path, data: dict[str, Any]) -> None:
+    """Write a JSON object atomically, ignoring any failure."""
+    import json
+
+    tmp_file = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file.write_text(json.dumps(data))
+        os.replace(tmp_file, path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            tmp_file.unlink()
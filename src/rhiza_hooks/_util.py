@@ -0,0 +1,52 @@
+"""Helpers shared by the hooks.
+
+Nothing here imports PyYAML at module import time, so hooks that never
+parse YAML do not pay for it.
+"""
+
+from __future__ import annotations
+
+import os
+from functools import cache, lru_cache
+from pathlib import Path
+
+# Sentinel distinguishing an absent key from one set to None
+MISSING = object()
+
+
+@cache
+def yaml_loader() -> type:
+    """Return the safe YAML loader class, importing PyYAML on first use.
+
+    Prefers the libyaml-backed CSafeLoader when PyYAML was built with it.
+    """
+    import yaml
+
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def find_repo_root_from(start: Path) -> Path:
+    """Walk up from ``start`` to the first directory containing ``.git``.
+
+    Results are memoized on ``start`` and its modification time, so a
+    ``.git`` created in ``start`` afterwards is still found. Falls back to
+    ``start`` when no ancestor holds ``.git``.
+    """
+    try:
+        mtime_ns = start.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    return _find_repo_root_from(start, mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _find_repo_root_from(start: Path, mtime_ns: int | None) -> Path:
+    """Walk up from ``start``; ``mtime_ns`` is only part of the cache key."""
+    # Walk on plain strings to avoid building a Path object per level
+    current = os.fspath(start)
+    parent = os.path.dirname(current)
+    while current != parent:
+        if os.path.exists(os.path.join(current, ".git")):
+            return Path(current)
+        current, parent = parent, os.path.dirname(parent)
+    return start
@@ -4,9 +4,9 @@
 from __future__ import annotations
 
 import argparse
+import os
 import re
 import sys
-from pathlib import Path
 
 # Common targets expected in rhiza-based projects
 RECOMMENDED_TARGETS = {
@@ -33,29 +33,31 @@ def extract_targets(content: str) -> set[str]:
     return set(matches)
 
 
-def check_makefile(filepath: Path) -> list[str]:
+def check_makefile(filepath: str | os.PathLike[str]) -> list[str]:
     """Check a Makefile for recommended targets.
 
     Args:
-        filepath: Path to the Makefile
+        filepath: Path to the Makefile, as a string or path-like object
 
     Returns:
         List of warning messages (empty if all recommended targets exist)
     """
     warnings: list[str] = []
+    path = os.fspath(filepath)
+
+    # Only check the main Makefile for recommended targets; other files are never opened
+    if os.path.basename(path) != "Makefile":
+        return warnings if os.path.exists(path) else [f"File not found: {filepath}"]
 
     try:
-        content = filepath.read_text()
+        with open(path) as f:
+            content = f.read()
     except FileNotFoundError:
         return [f"File not found: {filepath}"]
 
-    targets = extract_targets(content)
-
-    # Only check the main Makefile for recommended targets
-    if filepath.name == "Makefile":
-        missing = RECOMMENDED_TARGETS - targets
-        if missing:
-            warnings.append(f"Missing recommended targets: {', '.join(sorted(missing))}")
+    missing = RECOMMENDED_TARGETS - extract_targets(content)
+    if missing:
+        warnings.append(f"Missing recommended targets: {', '.join(sorted(missing))}")
 
     return warnings
 
@@ -76,9 +78,10 @@ def main(argv: list[str] | None = None) -> int:
     args = parser.parse_args(argv)
 
     retval = 0
-    for filename in args.filenames:
-        filepath = Path(filename)
-        warnings = check_makefile(filepath)
+    # pre-commit may pass the same path more than once; check each only once
+    for filename in dict.fromkeys(args.filenames):
+        # Pass the raw string through; no Path object is needed per filename
+        warnings = check_makefile(filename)
         if warnings:
             print(f"{filename}:")
             for warning in warnings:
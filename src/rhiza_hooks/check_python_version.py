@@ -6,13 +6,63 @@ from __future__ import annotations
 import argparse
 import re
 import sys
-import tomllib
+from functools import lru_cache
+from operator import eq, ge, gt, le, lt, ne
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from rhiza_hooks._util import find_repo_root_from
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Pattern to extract major.minor from a .python-version entry
+VERSION_PATTERN = re.compile(r"(\d+\.\d+)")
+
+# Pattern to split a requires-python constraint into operator and version
+REQUIRES_PYTHON_PATTERN = re.compile(r"([><=!~]+)?\s*(\d+\.\d+)")
+
+
+def _compatible_release(v: tuple[int, int], cv: tuple[int, int]) -> bool:
+    """Compatible release: ~=3.11 means >=3.11, <4.0."""
+    return v >= cv and v[0] == cv[0]
+
+
+# Comparison for each requires-python operator, looked up once per check
+CONSTRAINT_OPERATORS: dict[str, Callable[[tuple[int, int], tuple[int, int]], bool]] = {
+    ">=": ge,
+    ">": gt,
+    "<=": le,
+    "<": lt,
+    "==": eq,
+    "": eq,
+    "!=": ne,
+    "~=": _compatible_release,
+}
+
+
+def _mtime_ns(path: Path) -> int | None:
+    """Return the modification time of ``path``, or None if it cannot be read."""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=8)
+def _read_python_version(version_file: Path, mtime_ns: int) -> str:
+    """Read a .python-version file, cached per path and modification time."""
+    content = version_file.read_text().strip()
+    # Extract major.minor version
+    match = VERSION_PATTERN.match(content)
+    return match.group(1) if match else content
 
 
 def get_python_version_file(repo_root: Path) -> str | None:
     """Read Python version from .python-version file.
 
+    Results are memoized until the file's modification time changes.
+
     Args:
         repo_root: Root directory of the repository
 
@@ -20,13 +70,10 @@ def get_python_version_file(repo_root: Path) -> str | None:
         Python version string or None if file doesn't exist
     """
     version_file = repo_root / ".python-version"
-    if not version_file.exists():
+    mtime_ns = _mtime_ns(version_file)
+    if mtime_ns is None:
         return None
-
-    content = version_file.read_text().strip()
-    # Extract major.minor version
-    match = re.match(r"(\d+\.\d+)", content)
-    return match.group(1) if match else content
+    return _read_python_version(version_file, mtime_ns)
 
 
 def parse_version(version_str: str) -> tuple[int, int]:
@@ -42,9 +89,39 @@ def parse_version(version_str: str) -> tuple[int, int]:
     return (int(parts[0]), int(parts[1]))
 
 
+@lru_cache(maxsize=8)
+def _parse_pyproject(pyproject_file: Path, mtime_ns: int) -> dict[str, Any] | None:
+    """Parse pyproject.toml, cached per path and modification time."""
+    import tomllib
+
+    try:
+        with pyproject_file.open("rb") as f:
+            return tomllib.load(f)
+    except Exception:
+        return None
+
+
+def _load_pyproject(repo_root: Path) -> dict[str, Any] | None:
+    """Parse pyproject.toml, reusing the result while the file is unchanged.
+
+    Args:
+        repo_root: Root directory of the repository
+
+    Returns:
+        Parsed TOML data, or None if the file is missing or invalid
+    """
+    pyproject_file = repo_root / "pyproject.toml"
+    mtime_ns = _mtime_ns(pyproject_file)
+    if mtime_ns is None:
+        return None
+    return _parse_pyproject(pyproject_file, mtime_ns)
+
+
 def get_pyproject_requires_python(repo_root: Path) -> tuple[str, str] | None:
     """Read requires-python constraint from pyproject.toml.
 
+    The parsed file is memoized by ``_load_pyproject``.
+
     Args:
         repo_root: Root directory of the repository
 
@@ -52,14 +129,8 @@ def get_pyproject_requires_python(repo_root: Path) -> tuple[str, str] | None:
         Tuple of (operator, version) or None if not specified.
         For example: (">=", "3.11") or ("==", "3.12")
     """
-    pyproject_file = repo_root / "pyproject.toml"
-    if not pyproject_file.exists():
-        return None
-
-    try:
-        with pyproject_file.open("rb") as f:
-            data = tomllib.load(f)
-    except Exception:
+    data = _load_pyproject(repo_root)
+    if data is None:
         return None
 
     requires_python = data.get("project", {}).get("requires-python")
@@ -67,7 +138,7 @@ def get_pyproject_requires_python(repo_root: Path) -> tuple[str, str] | None:
         return None
 
     # Parse the constraint (e.g., ">=3.11", "==3.12", "~=3.11")
-    match = re.match(r"([><=!~]+)?\s*(\d+\.\d+)", requires_python.strip())
+    match = REQUIRES_PYTHON_PATTERN.match(requires_python.strip())
     if not match:
         return None
 
@@ -87,27 +158,11 @@ def version_satisfies_constraint(version: str, operator: str, constraint_version
     Returns:
         True if version satisfies the constraint
     """
-    v = parse_version(version)
-    cv = parse_version(constraint_version)
-
-    if operator == ">=":
-        return v >= cv
-    elif operator == ">":
-        return v > cv
-    elif operator == "<=":
-        return v <= cv
-    elif operator == "<":
-        return v < cv
-    elif operator == "==" or operator == "":
-        return v == cv
-    elif operator == "!=":
-        return v != cv
-    elif operator == "~=":
-        # Compatible release: ~=3.11 means >=3.11, <4.0
-        return v >= cv and v[0] == cv[0]
-    else:
+    compare = CONSTRAINT_OPERATORS.get(operator)
+    if compare is None:
         # Unknown operator, be permissive
         return True
+    return compare(parse_version(version), parse_version(constraint_version))
 
 
 def check_version_consistency(repo_root: Path) -> list[str]:
@@ -145,12 +200,7 @@ def find_repo_root() -> Path:
     Returns:
         Path to the repository root
     """
-    current = Path.cwd()
-    while current != current.parent:
-        if (current / ".git").exists():
-            return current
-        current = current.parent
-    return Path.cwd()
+    return find_repo_root_from(Path.cwd())
 
 
 def main(argv: list[str] | None = None) -> int:
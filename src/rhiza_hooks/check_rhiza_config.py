@@ -4,13 +4,20 @@
 from __future__ import annotations
 
 import argparse
+import os
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
-import yaml
+from rhiza_hooks._cache import cache_dir, file_stamp, load_json, prune_entries, save_json
+from rhiza_hooks._util import MISSING, yaml_loader
 
-REQUIRED_KEYS = {"template-repository", "template-branch"}
-OPTIONAL_KEYS = {"include", "exclude", "templates"}
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Key sets are frozen so the module-level schema cannot drift between calls
+REQUIRED_KEYS = frozenset({"template-repository", "template-branch"})
+OPTIONAL_KEYS = frozenset({"include", "exclude", "templates"})
 VALID_KEYS = REQUIRED_KEYS | OPTIONAL_KEYS
 
 
@@ -21,13 +28,21 @@ def _load_config(filepath: Path) -> dict | list[str]:
         Config dict on success, or list of error messages on failure
     """
     try:
-        with filepath.open() as f:
-            config = yaml.safe_load(f)
-    except yaml.YAMLError as e:
-        return [f"Invalid YAML: {e}"]
+        raw = filepath.read_bytes()
     except FileNotFoundError:
         return [f"File not found: {filepath}"]
 
+    # Missing and blank files fail without importing or running the parser
+    if not raw.strip():
+        return ["Configuration file is empty"]
+
+    import yaml
+
+    try:
+        config = yaml.load(raw, Loader=yaml_loader())  # nosec B506
+    except yaml.YAMLError as e:
+        return [f"Invalid YAML: {e}"]
+
     if config is None:
         return ["Configuration file is empty"]
 
@@ -37,87 +52,26 @@ def _load_config(filepath: Path) -> dict | list[str]:
     return config
 
 
-def _validate_required_keys(config: dict) -> list[str]:
-    """Validate required keys are present."""
-    errors = []
-    for key in REQUIRED_KEYS:
-        if key not in config:
-            errors.append(f"Missing required key: {key}")
-    return errors
-
+def _check_repository_format(repo: str) -> str | None:
+    """Require the 'owner/repo' form."""
+    if "/" not in repo:
+        return f"template-repository should be in 'owner/repo' format, got: {repo}"
+    return None
 
-def _validate_unknown_keys(config: dict) -> list[str]:
-    """Check for unknown keys."""
-    errors = []
-    for key in config:
-        if key not in VALID_KEYS:
-            errors.append(f"Unknown key: {key}")
-    return errors
 
+def _check_not_empty(message: str) -> Callable[[Any], str | None]:
+    """Build a check that reports ``message`` for an empty value."""
+    return lambda value: None if value else message
 
-def _validate_include_or_templates(config: dict) -> list[str]:
-    """Ensure at least one of 'include' or 'templates' is present."""
-    if "include" not in config and "templates" not in config:
-        return ["At least one of 'include' or 'templates' must be present"]
-    return []
-
-
-def _validate_template_repository(config: dict) -> list[str]:
-    """Validate template-repository field."""
-    errors = []
-    if "template-repository" in config:
-        repo = config["template-repository"]
-        if not isinstance(repo, str):
-            errors.append("template-repository must be a string")
-        elif "/" not in repo:
-            errors.append(f"template-repository should be in 'owner/repo' format, got: {repo}")
-    return errors
 
-
-def _validate_template_branch(config: dict) -> list[str]:
-    """Validate template-branch field."""
-    errors = []
-    if "template-branch" in config:
-        branch = config["template-branch"]
-        if not isinstance(branch, str):
-            errors.append("template-branch must be a string")
-        elif not branch:
-            errors.append("template-branch cannot be empty")
-    return errors
-
-
-def _validate_include_field(config: dict) -> list[str]:
-    """Validate include field."""
-    errors = []
-    if "include" in config:
-        include = config["include"]
-        if not isinstance(include, list):
-            errors.append("include must be a list")
-        elif not include:
-            errors.append("include list cannot be empty")
-    return errors
-
-
-def _validate_templates_field(config: dict) -> list[str]:
-    """Validate templates field."""
-    errors = []
-    if "templates" in config:
-        templates = config["templates"]
-        if not isinstance(templates, list):
-            errors.append("templates must be a list")
-        elif not templates:
-            errors.append("templates list cannot be empty")
-    return errors
-
-
-def _validate_exclude_field(config: dict) -> list[str]:
-    """Validate exclude field."""
-    errors = []
-    if "exclude" in config:
-        exclude = config["exclude"]
-        if exclude is not None and not isinstance(exclude, list):
-            errors.append("exclude must be a list or null")
-    return errors
+# Per-field rules: (key, accepted types, type error, extra check on a well-typed value)
+FIELD_RULES: tuple[tuple[str, type | tuple[type, ...], str, Callable[[Any], str | None] | None], ...] = (
+    ("template-repository", str, "template-repository must be a string", _check_repository_format),
+    ("template-branch", str, "template-branch must be a string", _check_not_empty("template-branch cannot be empty")),
+    ("include", list, "include must be a list", _check_not_empty("include list cannot be empty")),
+    ("templates", list, "templates must be a list", _check_not_empty("templates list cannot be empty")),
+    ("exclude", (list, type(None)), "exclude must be a list or null", None),
+)
 
 
 def validate_rhiza_config(filepath: Path) -> list[str]:
@@ -134,20 +88,47 @@ def validate_rhiza_config(filepath: Path) -> list[str]:
     if isinstance(config, list):
         return config
 
-    # Validate all aspects
-    errors = []
-    errors.extend(_validate_required_keys(config))
-    errors.extend(_validate_unknown_keys(config))
-    errors.extend(_validate_include_or_templates(config))
-    errors.extend(_validate_template_repository(config))
-    errors.extend(_validate_template_branch(config))
-    errors.extend(_validate_include_field(config))
-    errors.extend(_validate_templates_field(config))
-    errors.extend(_validate_exclude_field(config))
+    # Set operations on the keys view do the membership tests in C
+    missing = REQUIRED_KEYS - config.keys()
+    if missing:
+        # Without the required keys the rest of the config is not worth checking
+        return [f"Missing required key: {key}" for key in sorted(missing)]
+
+    # Validate all remaining aspects in one pass, collecting into a single list
+    errors: list[str] = []
+    unknown = config.keys() - VALID_KEYS
+    if unknown:
+        # Report in file order rather than set order
+        errors.extend(f"Unknown key: {key}" for key in config if key in unknown)
+
+    if "include" not in config and "templates" not in config:
+        errors.append("At least one of 'include' or 'templates' must be present")
+
+    for key, types, type_error, check in FIELD_RULES:
+        value = config.get(key, MISSING)
+        if value is MISSING:
+            continue
+        if not isinstance(value, types):
+            errors.append(type_error)
+        elif check is not None and (error := check(value)):
+            errors.append(error)
 
     return errors
 
 
+def _cache_file() -> Path:
+    """Return the file recording validation results per configuration file."""
+    return cache_dir() / "validation.json"
+
+
+def _cached_errors(entry: object, stamp: list[Any] | None) -> list[str] | None:
+    """Return the recorded errors if ``entry`` was stored for this exact file state."""
+    if stamp is None or not isinstance(entry, dict) or entry.get("stamp") != stamp:
+        return None
+    errors = entry.get("errors")
+    return errors if isinstance(errors, list) else None
+
+
 def main(argv: list[str] | None = None) -> int:
     """Main entry point for the hook."""
     parser = argparse.ArgumentParser(description="Validate .rhiza/template.yml configuration")
@@ -159,15 +140,35 @@ def main(argv: list[str] | None = None) -> int:
     args = parser.parse_args(argv)
 
     retval = 0
-    for filename in args.filenames:
+    results = load_json(_cache_file()) if args.filenames else {}
+    changed = False
+    report: list[str] = []
+    # pre-commit may pass the same path more than once; check each only once
+    for filename in dict.fromkeys(args.filenames):
         filepath = Path(filename)
-        errors = validate_rhiza_config(filepath)
+        key = os.path.abspath(filename)
+        stamp = file_stamp(filepath, __file__)
+        errors = _cached_errors(results.get(key), stamp)
+        if errors is None:
+            errors = validate_rhiza_config(filepath)
+            if stamp is not None:
+                # Re-insert so the entry counts as the newest when pruning
+                results.pop(key, None)
+                results[key] = {"stamp": stamp, "errors": errors}
+                changed = True
+
         if errors:
-            print(f"{filename}:")
-            for error in errors:
-                print(f"  - {error}")
+            report.append(f"{filename}:")
+            report.extend(f"  - {error}" for error in errors)
             retval = 1
 
+    if report:
+        # Emit the whole report in one write instead of a print per line
+        print("\n".join(report))
+
+    if changed:
+        save_json(_cache_file(), prune_entries(results))
+
     return retval
 
 
@@ -19,28 +19,92 @@ Exit codes:
 from __future__ import annotations
 
 import argparse
+import contextlib
 import sys
 from pathlib import Path
-from typing import Any
-from urllib.error import HTTPError, URLError
-from urllib.parse import urlparse
-from urllib.request import urlopen
+from typing import TYPE_CHECKING, Any
 
-import yaml
+from rhiza_hooks._cache import cache_dir, load_json, save_json
+from rhiza_hooks._util import MISSING, find_repo_root_from, yaml_loader
 
+if TYPE_CHECKING:
+    from collections.abc import Container
 
-def _load_yaml_file(bundles_path: Path) -> tuple[bool, dict[Any, Any] | list[str]]:
+    import yaml
+
+# Top-level keys every template-bundles.yml must define, in reporting order
+REQUIRED_TOP_LEVEL_FIELDS = ("version", "bundles")
+
+# Bundle keys that list other bundles by name
+DEPENDENCY_FIELDS = ("requires", "recommends")
+
+
+def _construct_selected_bundles(loader: Any, node: yaml.Node, templates: set[str]) -> Any:
+    """Construct a bundles document, building only the requested bundle bodies.
+
+    Every bundle name is kept so dependency checks still see the full set, but
+    bundles outside ``templates`` and unused top-level sections map to None.
+
+    Args:
+        loader: Loader instance that composed ``node``
+        node: Root node of the document
+        templates: Names of the bundles whose bodies are needed
+
+    Returns:
+        The partially constructed document
+    """
+    import yaml
+
+    if not isinstance(node, yaml.MappingNode):
+        return loader.construct_document(node)
+
+    loader.flatten_mapping(node)
+    data: dict[Any, Any] = {}
+    for key_node, value_node in node.value:
+        key = loader.construct_object(key_node, deep=True)
+        if key == "bundles" and isinstance(value_node, yaml.MappingNode):
+            loader.flatten_mapping(value_node)
+            bundles: dict[Any, Any] = {}
+            for name_node, body_node in value_node.value:
+                name = loader.construct_object(name_node, deep=True)
+                bundles[name] = loader.construct_object(body_node, deep=True) if name in templates else None
+            data[key] = bundles
+        elif key in {"version", "bundles"}:
+            data[key] = loader.construct_object(value_node, deep=True)
+        else:
+            data[key] = None
+    return data
+
+
+def _load_yaml_file(bundles_path: Path, templates: set[str] | None = None) -> tuple[bool, dict[Any, Any] | list[str]]:
     """Load and parse YAML file.
 
+    Args:
+        bundles_path: Path to template-bundles.yml
+        templates: Optional set of bundle names. If given, only these bundles are
+            fully constructed; the bodies of all other bundles are left as None.
+
     Returns:
         Tuple of (success, data_or_errors)
     """
-    if not bundles_path.exists():
+    # Hand libyaml the raw bytes; it detects the encoding itself
+    try:
+        content = bundles_path.read_bytes()
+    except OSError:
         return False, [f"Template bundles file not found: {bundles_path}"]
 
+    import yaml
+
     try:
-        with open(bundles_path) as f:
-            data = yaml.safe_load(f)
+        if templates is None:
+            data = yaml.load(content, Loader=yaml_loader())  # nosec B506
+        else:
+            loader = yaml_loader()(content)
+            try:
+                node = loader.get_single_node()
+                data = None if node is None else _construct_selected_bundles(loader, node, templates)
+            finally:
+                loader.dispose()
     except yaml.YAMLError as e:
         return False, [f"Invalid YAML: {e}"]
 
@@ -52,58 +116,66 @@ def _load_yaml_file(bundles_path: Path) -> tuple[bool, dict[Any, Any] | list[str
 
 def _validate_top_level_fields(data: dict[Any, Any]) -> list[str]:
     """Validate required top-level fields."""
-    errors = []
-    required_fields = {"version", "bundles"}
-    for field in required_fields:
-        if field not in data:
-            errors.append(f"Missing required field: {field}")
-    return errors
+    return [f"Missing required field: {field}" for field in REQUIRED_TOP_LEVEL_FIELDS if field not in data]
 
 
 def _validate_bundle_structure(
     bundle_name: str,
     bundle_config: dict[Any, Any] | object,
-    bundle_names: set[str],
+    bundle_names: Container[str],
+    errors: list[str] | None = None,
 ) -> list[str]:
-    """Validate a single bundle's structure and dependencies."""
-    errors = []
+    """Validate a single bundle's structure and dependencies.
+
+    Errors are appended to ``errors`` when given, so callers can collect
+    across bundles without an intermediate list per bundle.
+    """
+    if errors is None:
+        errors = []
 
     if not isinstance(bundle_config, dict):
         errors.append(f"Bundle '{bundle_name}' must be a dictionary")
         return errors
 
-    # Check required fields
+    # Check required fields, skipping the dependency walk if any is absent
+    incomplete = False
     if "description" not in bundle_config:
         errors.append(f"Bundle '{bundle_name}' missing 'description'")
+        incomplete = True
 
-    if "files" not in bundle_config:
+    files = bundle_config.get("files", MISSING)
+    if files is MISSING:
         errors.append(f"Bundle '{bundle_name}' missing 'files'")
-    elif not isinstance(bundle_config["files"], list):
+        incomplete = True
+    elif not isinstance(files, list):
         errors.append(f"Bundle '{bundle_name}' 'files' must be a list")
 
-    # Validate dependencies
-    if "requires" in bundle_config:
-        if not isinstance(bundle_config["requires"], list):
-            errors.append(f"Bundle '{bundle_name}' 'requires' must be a list")
-        else:
-            for dep in bundle_config["requires"]:
-                if dep not in bundle_names:
-                    errors.append(f"Bundle '{bundle_name}' requires non-existent bundle '{dep}'")
+    if incomplete:
+        return errors
 
-    if "recommends" in bundle_config:
-        if not isinstance(bundle_config["recommends"], list):
-            errors.append(f"Bundle '{bundle_name}' 'recommends' must be a list")
-        else:
-            for dep in bundle_config["recommends"]:
-                if dep not in bundle_names:
-                    errors.append(f"Bundle '{bundle_name}' recommends non-existent bundle '{dep}'")
+    # Validate dependencies, looking each field up only once
+    for field in DEPENDENCY_FIELDS:
+        deps = bundle_config.get(field, MISSING)
+        if deps is MISSING:
+            continue
+        if not isinstance(deps, list):
+            errors.append(f"Bundle '{bundle_name}' '{field}' must be a list")
+            continue
+        errors.extend(
+            f"Bundle '{bundle_name}' {field} non-existent bundle '{dep}'" for dep in deps if dep not in bundle_names
+        )
 
     return errors
 
 
-def _validate_examples(examples: dict[Any, Any] | object, bundle_names: set[str]) -> list[str]:
-    """Validate examples section."""
-    errors = []
+def _validate_examples(
+    examples: dict[Any, Any] | object,
+    bundle_names: Container[str],
+    errors: list[str] | None = None,
+) -> list[str]:
+    """Validate examples section, appending to ``errors`` when given."""
+    if errors is None:
+        errors = []
 
     if not isinstance(examples, dict):
         errors.append("'examples' must be a dictionary")
@@ -122,9 +194,14 @@ def _validate_examples(examples: dict[Any, Any] | object, bundle_names: set[str]
     return errors
 
 
-def _validate_metadata(metadata: dict[Any, Any], bundles: dict[Any, Any]) -> list[str]:
-    """Validate metadata section."""
-    errors = []
+def _validate_metadata(
+    metadata: dict[Any, Any],
+    bundles: dict[Any, Any],
+    errors: list[str] | None = None,
+) -> list[str]:
+    """Validate metadata section, appending to ``errors`` when given."""
+    if errors is None:
+        errors = []
 
     if "total_bundles" in metadata:
         expected_count = len(bundles)
@@ -143,12 +220,7 @@ def find_repo_root() -> Path:
     Returns:
         Path to the repository root
     """
-    current = Path.cwd()
-    while current != current.parent:
-        if (current / ".git").exists():
-            return current
-        current = current.parent
-    return Path.cwd()
+    return find_repo_root_from(Path.cwd())
 
 
 def _get_config_data(config_path: Path) -> dict[str, Any] | None:
@@ -160,13 +232,11 @@ def _get_config_data(config_path: Path) -> dict[str, Any] | None:
     Returns:
         Configuration dictionary, or None if file not found or invalid
     """
-    if not config_path.exists():
-        return None
+    import yaml
 
     try:
-        with open(config_path) as f:
-            config = yaml.safe_load(f)
-    except yaml.YAMLError:
+        config = yaml.load(config_path.read_bytes(), Loader=yaml_loader())  # nosec B506
+    except (OSError, yaml.YAMLError):
         return None
 
     if not isinstance(config, dict):
@@ -198,6 +268,21 @@ def _get_templates_from_config(config_path: Path) -> set[str] | None:
     return set(templates)
 
 
+def _bundles_cache_file() -> Path:
+    """Return the file holding remote bundles alongside their ETags."""
+    return cache_dir() / "bundles.json"
+
+
+def _cached_response(entry: object) -> tuple[str, str] | None:
+    """Return ``(etag, body)`` from a bundles cache entry, if it is well-formed."""
+    if not isinstance(entry, dict):
+        return None
+    etag, body = entry.get("etag"), entry.get("body")
+    if isinstance(etag, str) and isinstance(body, str):
+        return etag, body
+    return None
+
+
 def _fetch_remote_bundles(repo: str, branch: str) -> tuple[bool, dict[Any, Any] | list[str]]:
     """Fetch template-bundles.yml from a remote GitHub repository.
 
@@ -208,6 +293,11 @@ def _fetch_remote_bundles(repo: str, branch: str) -> tuple[bool, dict[Any, Any]
     Returns:
         Tuple of (success, data_or_errors)
     """
+    # urllib.request pulls in http.client and ssl; only pay for it when fetching
+    from urllib.error import HTTPError, URLError
+    from urllib.parse import urlparse
+    from urllib.request import Request, urlopen
+
     # Construct GitHub raw content URL
     url = f"https://raw.githubusercontent.com/{repo}/{branch}/.rhiza/template-bundles.yml"
 
@@ -216,20 +306,41 @@ def _fetch_remote_bundles(repo: str, branch: str) -> tuple[bool, dict[Any, Any]
     if parsed.scheme != "https":
         return False, [f"Invalid URL scheme: {parsed.scheme}. Only https is allowed."]
 
+    # Revalidate a previously fetched copy instead of downloading it again
+    cache_file = _bundles_cache_file()
+    fetched = load_json(cache_file)
+    cached = _cached_response(fetched.get(url))
+    headers = {"If-None-Match": cached[0]} if cached else {}
+
+    content: bytes | str
     try:
-        with urlopen(url, timeout=10) as response:  # nosec B310
+        with urlopen(Request(url, headers=headers), timeout=10) as response:  # nosec B310
             content = response.read()
+            etag = response.headers.get("ETag")
     except HTTPError as e:
-        if e.code == 404:
+        if e.code == 304 and cached:
+            # yaml reads the cached text directly, no need to re-encode it
+            content, etag = cached[1], None
+        elif e.code == 404:
             return False, [f"Template bundles file not found in repository {repo} (branch: {branch})"]
-        return False, [f"HTTP error fetching template bundles: {e.code} {e.reason}"]
+        else:
+            return False, [f"HTTP error fetching template bundles: {e.code} {e.reason}"]
     except URLError as e:
         return False, [f"Error fetching template bundles from {url}: {e.reason}"]
     except TimeoutError:
         return False, [f"Timeout fetching template bundles from {url}"]
 
+    if isinstance(etag, str) and isinstance(content, bytes):
+        # Parse the decoded text that gets cached so only one copy stays alive
+        with contextlib.suppress(UnicodeDecodeError):
+            content = content.decode("utf-8")
+            fetched[url] = {"etag": etag, "body": content}
+            save_json(cache_file, fetched)
+
+    import yaml
+
     try:
-        data = yaml.safe_load(content)
+        data = yaml.load(content, Loader=yaml_loader())  # nosec B506
     except yaml.YAMLError as e:
         return False, [f"Invalid YAML in remote template bundles: {e}"]
 
@@ -252,8 +363,8 @@ def validate_template_bundles(bundles_path: Path, templates_to_check: set[str] |
     Returns:
         Tuple of (success, error_messages)
     """
-    # Load YAML file
-    success, data_or_errors = _load_yaml_file(bundles_path)
+    # Load YAML file, skipping construction of bundles we won't validate
+    success, data_or_errors = _load_yaml_file(bundles_path, templates_to_check)
     if not success:
         # Type narrowing: when success is False, data_or_errors is list[str]
         assert isinstance(data_or_errors, list)
@@ -261,19 +372,32 @@ def validate_template_bundles(bundles_path: Path, templates_to_check: set[str] |
 
     # Type narrowing: when success is True, data_or_errors is dict[Any, Any]
     assert isinstance(data_or_errors, dict)
-    data = data_or_errors
+    errors = _validate_bundles_data(data_or_errors, templates_to_check)
+    return len(errors) == 0, errors
+
+
+def _validate_bundles_data(data: dict[Any, Any], templates_to_check: set[str] | None = None) -> list[str]:
+    """Validate an already-parsed template bundles document.
+
+    Args:
+        data: Parsed contents of template-bundles.yml
+        templates_to_check: Optional set of template names to validate. If None, validate all.
 
+    Returns:
+        List of error messages (empty if valid)
+    """
     # Validate top-level fields
     errors = _validate_top_level_fields(data)
     if errors:
-        return False, errors
+        return errors
 
     # Validate bundles section
     bundles = data.get("bundles", {})
     if not isinstance(bundles, dict):
-        return False, ["'bundles' must be a dictionary"]
+        return ["'bundles' must be a dictionary"]
 
-    bundle_names = set(bundles.keys())
+    # dict views already give O(1) membership, no need to copy the names
+    bundle_names = bundles.keys()
 
     # If templates_to_check is specified, verify they exist
     if templates_to_check is not None:
@@ -288,17 +412,17 @@ def validate_template_bundles(bundles_path: Path, templates_to_check: set[str] |
     for bundle_name in bundles_to_validate:
         if bundle_name in bundles:
             bundle_config = bundles[bundle_name]
-            errors.extend(_validate_bundle_structure(bundle_name, bundle_config, bundle_names))
+            _validate_bundle_structure(bundle_name, bundle_config, bundle_names, errors)
 
     # Validate examples section (only if validating all bundles)
     if templates_to_check is None and "examples" in data:
-        errors.extend(_validate_examples(data["examples"], bundle_names))
+        _validate_examples(data["examples"], bundle_names, errors)
 
     # Validate metadata if present (only if validating all bundles)
     if templates_to_check is None and "metadata" in data:
-        errors.extend(_validate_metadata(data["metadata"], bundles))
+        _validate_metadata(data["metadata"], bundles, errors)
 
-    return len(errors) == 0, errors
+    return errors
 
 
 def _get_config_path(args: argparse.Namespace) -> Path:
@@ -368,8 +492,8 @@ def _validate_remote_bundles(
 
 def _validate_templates_in_bundles(templates_set: set[str], bundles: dict[Any, Any], config_path: Path) -> list[str]:
     """Validate that requested templates exist and have valid structure."""
-    errors = []
-    bundle_names = set(bundles.keys())
+    errors: list[str] = []
+    bundle_names = bundles.keys()
 
     # Check if templates exist
     for template in templates_set:
@@ -380,7 +504,7 @@ def _validate_templates_in_bundles(templates_set: set[str], bundles: dict[Any, A
     for template in templates_set:
         if template in bundles:
             bundle_config = bundles[template]
-            errors.extend(_validate_bundle_structure(template, bundle_config, bundle_names))
+            _validate_bundle_structure(template, bundle_config, bundle_names, errors)
 
     return errors
 
@@ -10,9 +10,35 @@ Migrated from: https://github.com/Jebel-Quant/rhiza/.rhiza/scripts/check_workflo
 
 from __future__ import annotations
 
+import os
+import re
 import sys
+from pathlib import Path
 
-import yaml
+from rhiza_hooks._cache import cache_dir, file_stamp, load_json, prune_entries, save_json
+from rhiza_hooks._util import yaml_loader
+
+# Prefix every rhiza workflow name must carry
+PREFIX = "(RHIZA) "
+
+# The top-level name field, assumed to start at the beginning of a line
+NAME_LINE_PATTERN = re.compile(rb"^name:[^\r\n]*", re.MULTILINE)
+
+
+def _expected_name(name: str) -> str:
+    """Return the workflow name with the (RHIZA) prefix and an uppercase body."""
+    # Remove prefix if present to verify the rest of the string
+    clean_name = name[len(PREFIX) :] if name.startswith(PREFIX) else name
+    return f"{PREFIX}{clean_name.upper()}"
+
+
+def _has_expected_name(name: str) -> bool:
+    """Return True if ``name`` already equals ``_expected_name(name)``.
+
+    Checks the prefix and body in place, so correct names never build the
+    expected string.
+    """
+    return name.startswith(PREFIX) and (body := name[len(PREFIX) :]) == body.upper()
 
 
 def check_file(filepath: str) -> bool:
@@ -24,12 +50,17 @@ def check_file(filepath: str) -> bool:
     Returns:
         bool: True if file is correct, False if it was updated or has errors.
     """
-    with open(filepath) as f:
-        try:
-            content = yaml.safe_load(f)
-        except yaml.YAMLError as exc:
-            print(f"Error parsing YAML {filepath}: {exc}")
-            return False
+    # Read once: libyaml parses the bytes directly and a rewrite reuses them
+    with open(filepath, "rb") as f:
+        raw = f.read()
+
+    import yaml
+
+    try:
+        content = yaml.load(raw, Loader=yaml_loader())  # nosec B506
+    except yaml.YAMLError as exc:
+        print(f"Error parsing YAML {filepath}: {exc}")
+        return False
 
     if not isinstance(content, dict):
         # Empty file or not a dict
@@ -40,48 +71,52 @@ def check_file(filepath: str) -> bool:
         print(f"Error: {filepath} missing 'name' field.")
         return False
 
-    prefix = "(RHIZA) "
-    # Remove prefix if present to verify the rest of the string
-    if name.startswith(prefix):
-        clean_name = name[len(prefix) :]
-    else:
-        clean_name = name
-
-    expected_name = f"{prefix}{clean_name.upper()}"
-
-    if name != expected_name:
+    if not _has_expected_name(name):
+        # Only the rewrite path needs the expected name itself
+        expected_name = _expected_name(name)
         print(f"Updating {filepath}: name '{name}' -> '{expected_name}'")
 
-        # Read file lines to perform replacement while preserving comments
-        with open(filepath) as f_read:
-            lines = f_read.readlines()
-
-        with open(filepath, "w") as f_write:
-            replaced = False
-            for line in lines:
-                # Replace only the top-level name field (assumes it starts at beginning of line)
-                if not replaced and line.startswith("name:"):
-                    # Check if this line corresponds to the extracted name.
-                    # Simple check: does it contain reasonable parts of the name?
-                    # Or just blinding replace top-level name:
-                    # We'll use quotes to be safe
-                    f_write.write(f'name: "{expected_name}"\n')
-                    replaced = True
-                else:
-                    f_write.write(line)
+        # Replace only the top-level name line, keeping comments and line endings
+        match = NAME_LINE_PATTERN.search(raw)
+        if match:
+            # We'll use quotes to be safe
+            new_line = f'name: "{expected_name}"'.encode()
+            with open(filepath, "wb") as f_write:
+                f_write.write(raw[: match.start()] + new_line + raw[match.end() :])
 
         return False  # Fail so pre-commit knows files were modified
 
     return True
 
 
+def _cache_file() -> Path:
+    """Return the file recording which workflows already passed."""
+    return cache_dir() / "workflow_names.json"
+
+
 def main(argv: list[str] | None = None) -> int:
     """Execute the script."""
     files = argv if argv is not None else sys.argv[1:]
+    # Only passing files are recorded: failures print or rewrite, so they always rerun
+    passed = load_json(_cache_file()) if files else {}
+    changed = False
     failed = False
     for f in files:
+        key = os.path.abspath(f)
+        stamp = file_stamp(f, __file__)
+        entry = passed.get(key)
+        if stamp is not None and isinstance(entry, dict) and entry.get("stamp") == stamp:
+            continue
         if not check_file(f):
             failed = True
+        elif stamp is not None:
+            # Re-insert so the entry counts as the newest when pruning
+            passed.pop(key, None)
+            passed[key] = {"stamp": stamp}
+            changed = True
+
+    if changed:
+        save_json(_cache_file(), prune_entries(passed))
 
     if failed:
         sys.exit(1)
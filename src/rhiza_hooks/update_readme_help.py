@@ -10,11 +10,12 @@ This is a Python wrapper that provides the same functionality.
 
 from __future__ import annotations
 
-import re
 import subprocess  # nosec B404
 import sys
 from pathlib import Path
 
+from rhiza_hooks._util import find_repo_root_from
+
 # Markers used to identify the section to update in README
 START_MARKER = "<!-- MAKE_HELP_START -->"
 END_MARKER = "<!-- MAKE_HELP_END -->"
@@ -27,10 +28,11 @@ def get_make_help_output() -> str | None:
         The output from 'make help', or None if the command fails.
     """
     try:
+        # Collect raw bytes and decode once, rather than through a text-mode pipe;
+        # newlines are normalized below the way a text-mode pipe would
         result = subprocess.run(  # nosec B603 B607
             ["make", "help"],
             capture_output=True,
-            text=True,
             check=True,
             timeout=30,
         )
@@ -44,7 +46,7 @@ def get_make_help_output() -> str | None:
         print("Error: 'make' command not found")
         return None
     else:
-        return result.stdout
+        return result.stdout.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
 
 
 def update_readme_with_help(readme_path: Path, help_output: str) -> bool:
@@ -63,27 +65,32 @@ def update_readme_with_help(readme_path: Path, help_output: str) -> bool:
 
     content = readme_path.read_text()
 
-    # Check if markers exist
-    if START_MARKER not in content or END_MARKER not in content:
-        # No markers, nothing to update
-        return False
-
     # Build the new content between markers
     new_section = f"{START_MARKER}\n```\n{help_output}```\n{END_MARKER}"
 
-    # Replace the content between markers
-    pattern = re.compile(
-        re.escape(START_MARKER) + r".*?" + re.escape(END_MARKER),
-        re.DOTALL,
-    )
-    new_content = pattern.sub(new_section, content)
-
-    if new_content != content:
-        readme_path.write_text(new_content)
-        print(f"Updated {readme_path} with make help output")
-        return True
+    # Replace each marked section; the markers are literals so plain slicing will do
+    parts: list[str] = []
+    changed = False
+    pos = 0
+    while (start := content.find(START_MARKER, pos)) != -1:
+        end = content.find(END_MARKER, start + len(START_MARKER))
+        if end == -1:
+            break
+        end += len(END_MARKER)
+        # Only the marked sections can differ, so compare those instead of the whole file
+        changed = changed or content[start:end] != new_section
+        parts.append(content[pos:start])
+        parts.append(new_section)
+        pos = end
+
+    if not changed:
+        # No markers or the help output is already current, nothing to update
+        return False
 
-    return False
+    parts.append(content[pos:])
+    readme_path.write_text("".join(parts))
+    print(f"Updated {readme_path} with make help output")
+    return True
 
 
 def find_repo_root() -> Path:
@@ -92,12 +99,7 @@ def find_repo_root() -> Path:
     Returns:
         Path to the repository root.
     """
-    current = Path.cwd()
-    while current != current.parent:
-        if (current / ".git").exists():
-            return current
-        current = current.parent
-    return Path.cwd()
+    return find_repo_root_from(Path.cwd())
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -0,0 +1,32 @@
+"""Shared fixtures for the rhiza-hooks test suite."""
+
+from __future__ import annotations
+
+from itertools import count
+from pathlib import Path
+
+import pytest
+
+# Suffixes keeping every per-test directory under the session temp dir unique
+_DIR_IDS = count()
+
+
+def _fresh_dir(root: Path, prefix: str) -> Path:
+    """Create and return a new empty directory under ``root``."""
+    path = root / f"{prefix}{next(_DIR_IDS)}"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture(scope="session")
+def _session_tmp(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Return one numbered pytest temp dir shared by the whole session."""
+    return tmp_path_factory.mktemp("session")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(_session_tmp: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep hook caches out of the user's real cache directory."""
+    cache_dir = _fresh_dir(_session_tmp, "cache-")
+    monkeypatch.setenv("RHIZA_HOOKS_CACHE_DIR", str(cache_dir))
+    return cache_dir
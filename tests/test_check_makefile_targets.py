@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import runpy
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -118,6 +120,21 @@ install:
         assert len(warnings) == 1
         assert "not found" in warnings[0].lower()
 
+    def test_indented_recipe_lines_are_not_targets(self, tmp_path: Path) -> None:
+        """Lines inside a recipe are not mistaken for target definitions."""
+        makefile = tmp_path / "Makefile"
+        makefile.write_text("install:\n\ttest: not a target\n")
+        warnings = check_makefile(makefile)
+        assert len(warnings) == 1
+        assert "test" in warnings[0]
+
+    def test_accepts_string_path(self, tmp_path: Path) -> None:
+        """A plain string filename works like a Path."""
+        makefile = tmp_path / "Makefile"
+        makefile.write_text("install:\ntest:\nfmt:\nhelp:\n")
+        assert check_makefile(str(makefile)) == []
+        assert check_makefile(str(tmp_path / "nonexistent")) == [f"File not found: {tmp_path / 'nonexistent'}"]
+
     def test_non_makefile_skips_target_check(self, tmp_path: Path) -> None:
         """Non-Makefile files don't get target recommendations."""
         mk_file = tmp_path / "custom.mk"
@@ -126,6 +143,15 @@ install:
         # Should not warn about missing targets for non-Makefile files
         assert warnings == []
 
+    def test_non_makefile_is_not_opened(self, tmp_path: Path) -> None:
+        """Files other than Makefile are skipped before any open, so read errors cannot surface."""
+        mk_file = tmp_path / "custom.mk"
+        mk_file.write_text("install:\n")
+
+        with patch("builtins.open", side_effect=PermissionError) as mock_open:
+            assert check_makefile(mk_file) == []
+        mock_open.assert_not_called()
+
 
 class TestMain:
     """Tests for main function."""
@@ -162,6 +188,16 @@ help:
 
         assert result == 1
 
+    def test_main_duplicate_filenames_checked_once(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """A path passed more than once is only reported once."""
+        makefile = tmp_path / "Makefile"
+        makefile.write_text("install:\n")
+
+        main([str(makefile), str(makefile)])
+
+        captured = capsys.readouterr()
+        assert captured.out.count("Missing recommended targets") == 1
+
     def test_main_no_files(self) -> None:
         """Main returns 0 when no files provided."""
         result = main([])
@@ -173,9 +209,6 @@ class TestModuleExecution:
 
     def test_module_executes_main(self) -> None:
         """Module execution calls main and exits with its return value."""
-        import runpy
-        from unittest.mock import patch
-
         with (
             patch("rhiza_hooks.check_makefile_targets.sys.argv", ["check_makefile_targets"]),
             patch("rhiza_hooks.check_makefile_targets.sys.exit") as mock_exit,
@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
+from rhiza_hooks._util import _find_repo_root_from
 from rhiza_hooks.check_python_version import (
+    _load_pyproject,
+    _parse_pyproject,
+    _read_python_version,
     check_version_consistency,
     find_repo_root,
     get_pyproject_requires_python,
@@ -18,6 +23,17 @@ from rhiza_hooks.check_python_version import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    """Run every test with empty memoization caches, leaving none behind."""
+    caches = (_read_python_version, _parse_pyproject, _find_repo_root_from)
+    for cached in caches:
+        cached.cache_clear()
+    yield
+    for cached in caches:
+        cached.cache_clear()
+
+
 class TestParseVersion:
     """Tests for parse_version function."""
 
@@ -38,65 +54,29 @@ class TestParseVersion:
 class TestVersionSatisfiesConstraint:
     """Tests for version_satisfies_constraint function."""
 
-    def test_gte_satisfied(self) -> None:
-        """Version 3.12 satisfies >=3.11."""
-        assert version_satisfies_constraint("3.12", ">=", "3.11") is True
-
-    def test_gte_exact_match(self) -> None:
-        """Version 3.11 satisfies >=3.11."""
-        assert version_satisfies_constraint("3.11", ">=", "3.11") is True
-
-    def test_gte_not_satisfied(self) -> None:
-        """Version 3.10 does not satisfy >=3.11."""
-        assert version_satisfies_constraint("3.10", ">=", "3.11") is False
-
-    def test_gt_satisfied(self) -> None:
-        """Version 3.12 satisfies >3.11."""
-        assert version_satisfies_constraint("3.12", ">", "3.11") is True
-
-    def test_gt_not_satisfied_equal(self) -> None:
-        """Version 3.11 does not satisfy >3.11."""
-        assert version_satisfies_constraint("3.11", ">", "3.11") is False
-
-    def test_lte_satisfied(self) -> None:
-        """Version 3.11 satisfies <=3.12."""
-        assert version_satisfies_constraint("3.11", "<=", "3.12") is True
-
-    def test_lt_satisfied(self) -> None:
-        """Version 3.11 satisfies <3.12."""
-        assert version_satisfies_constraint("3.11", "<", "3.12") is True
-
-    def test_eq_satisfied(self) -> None:
-        """Version 3.11 satisfies ==3.11."""
-        assert version_satisfies_constraint("3.11", "==", "3.11") is True
-
-    def test_eq_not_satisfied(self) -> None:
-        """Version 3.12 does not satisfy ==3.11."""
-        assert version_satisfies_constraint("3.12", "==", "3.11") is False
-
-    def test_ne_satisfied(self) -> None:
-        """Version 3.12 satisfies !=3.11."""
-        assert version_satisfies_constraint("3.12", "!=", "3.11") is True
-
-    def test_ne_not_satisfied(self) -> None:
-        """Version 3.11 does not satisfy !=3.11."""
-        assert version_satisfies_constraint("3.11", "!=", "3.11") is False
-
-    def test_compatible_release_satisfied(self) -> None:
-        """Version 3.12 satisfies ~=3.11 (same major)."""
-        assert version_satisfies_constraint("3.12", "~=", "3.11") is True
-
-    def test_compatible_release_not_satisfied(self) -> None:
-        """Version 4.0 does not satisfy ~=3.11 (different major)."""
-        assert version_satisfies_constraint("4.0", "~=", "3.11") is False
-
-    def test_compatible_release_lower_not_satisfied(self) -> None:
-        """Version 3.10 does not satisfy ~=3.11."""
-        assert version_satisfies_constraint("3.10", "~=", "3.11") is False
-
-    def test_unknown_operator_returns_true(self) -> None:
-        """Unknown operator is permissive and returns True."""
-        assert version_satisfies_constraint("3.12", "???", "3.11") is True
+    @pytest.mark.parametrize(
+        ("version", "operator", "constraint_version", "expected"),
+        [
+            pytest.param("3.12", ">=", "3.11", True, id="gte_satisfied"),
+            pytest.param("3.11", ">=", "3.11", True, id="gte_exact_match"),
+            pytest.param("3.10", ">=", "3.11", False, id="gte_not_satisfied"),
+            pytest.param("3.12", ">", "3.11", True, id="gt_satisfied"),
+            pytest.param("3.11", ">", "3.11", False, id="gt_not_satisfied_equal"),
+            pytest.param("3.11", "<=", "3.12", True, id="lte_satisfied"),
+            pytest.param("3.11", "<", "3.12", True, id="lt_satisfied"),
+            pytest.param("3.11", "==", "3.11", True, id="eq_satisfied"),
+            pytest.param("3.12", "==", "3.11", False, id="eq_not_satisfied"),
+            pytest.param("3.12", "!=", "3.11", True, id="ne_satisfied"),
+            pytest.param("3.11", "!=", "3.11", False, id="ne_not_satisfied"),
+            pytest.param("3.12", "~=", "3.11", True, id="compatible_release_satisfied"),
+            pytest.param("4.0", "~=", "3.11", False, id="compatible_release_not_satisfied"),
+            pytest.param("3.10", "~=", "3.11", False, id="compatible_release_lower_not_satisfied"),
+            pytest.param("3.12", "???", "3.11", True, id="unknown_operator_returns_true"),
+        ],
+    )
+    def test_constraint(self, version: str, operator: str, constraint_version: str, expected: bool) -> None:
+        """Each operator compares major.minor tuples; an unknown operator is permissive."""
+        assert version_satisfies_constraint(version, operator, constraint_version) is expected
 
 
 class TestGetPythonVersionFile:
@@ -116,6 +96,23 @@ class TestGetPythonVersionFile:
         """Returns None if file doesn't exist."""
         assert get_python_version_file(tmp_path) is None
 
+    def test_result_is_memoized(self, tmp_path: Path) -> None:
+        """Repeated reads of an unchanged file are served from the cache."""
+        (tmp_path / ".python-version").write_text("3.12\n")
+        assert get_python_version_file(tmp_path) == "3.12"
+        assert get_python_version_file(tmp_path) == "3.12"
+        assert _read_python_version.cache_info().hits == 1
+
+    def test_modified_file_is_reread(self, tmp_path: Path) -> None:
+        """A new modification time invalidates the memoized version."""
+        version_file = tmp_path / ".python-version"
+        version_file.write_text("3.12\n")
+        assert get_python_version_file(tmp_path) == "3.12"
+
+        version_file.write_text("3.13\n")
+        os.utime(version_file, ns=(0, version_file.stat().st_mtime_ns + 1))
+        assert get_python_version_file(tmp_path) == "3.13"
+
 
 class TestGetPyprojectRequiresPython:
     """Tests for get_pyproject_requires_python function."""
@@ -161,6 +158,40 @@ class TestGetPyprojectRequiresPython:
         assert get_pyproject_requires_python(tmp_path) is None
 
 
+class TestLoadPyproject:
+    """Tests for _load_pyproject function."""
+
+    def test_parses_file(self, tmp_path: Path) -> None:
+        """Returns the parsed TOML document."""
+        (tmp_path / "pyproject.toml").write_text('[project]\nname = "test"\n')
+        assert _load_pyproject(tmp_path) == {"project": {"name": "test"}}
+
+    def test_missing_file_returns_none(self, tmp_path: Path) -> None:
+        """Returns None if file doesn't exist."""
+        assert _load_pyproject(tmp_path) is None
+
+    def test_invalid_toml_returns_none(self, tmp_path: Path) -> None:
+        """Returns None if pyproject.toml is invalid."""
+        (tmp_path / "pyproject.toml").write_text("this is not valid toml {{{{")
+        assert _load_pyproject(tmp_path) is None
+
+    def test_result_is_memoized(self, tmp_path: Path) -> None:
+        """An unchanged file is parsed only once."""
+        (tmp_path / "pyproject.toml").write_text('[project]\nrequires-python = ">=3.11"\n')
+        assert _load_pyproject(tmp_path) is _load_pyproject(tmp_path)
+        assert _parse_pyproject.cache_info().misses == 1
+
+    def test_modified_file_is_reparsed(self, tmp_path: Path) -> None:
+        """A new modification time invalidates the memoized document."""
+        pyproject = tmp_path / "pyproject.toml"
+        pyproject.write_text('[project]\nrequires-python = ">=3.11"\n')
+        assert get_pyproject_requires_python(tmp_path) == (">=", "3.11")
+
+        pyproject.write_text('[project]\nrequires-python = ">=3.12"\n')
+        os.utime(pyproject, ns=(0, pyproject.stat().st_mtime_ns + 1))
+        assert get_pyproject_requires_python(tmp_path) == (">=", "3.12")
+
+
 class TestCheckVersionConsistency:
     """Tests for check_version_consistency function."""
 
@@ -248,6 +279,37 @@ class TestFindRepoRoot:
             result = find_repo_root()
             assert result == subdir
 
+    def test_git_file_marks_root(self, tmp_path: Path) -> None:
+        """A .git file (worktree or submodule) also marks the repo root."""
+        (tmp_path / ".git").write_text("gitdir: /elsewhere\n")
+        subdir = tmp_path / "src"
+        subdir.mkdir()
+
+        with patch("rhiza_hooks.check_python_version.Path.cwd", return_value=subdir):
+            assert find_repo_root() == tmp_path
+
+    def test_walk_is_memoized_per_cwd(self, tmp_path: Path) -> None:
+        """Repeated lookups from the same cwd don't walk the tree again."""
+        (tmp_path / ".git").mkdir()
+
+        with patch("rhiza_hooks.check_python_version.Path.cwd", return_value=tmp_path):
+            assert find_repo_root() == tmp_path
+            assert find_repo_root() == tmp_path
+        assert _find_repo_root_from.cache_info().hits == 1
+
+    def test_git_created_after_lookup_is_found(self, tmp_path: Path) -> None:
+        """Creating .git in the cwd changes its mtime and so misses the memo."""
+        (tmp_path / ".git").mkdir()
+        subdir = tmp_path / "submodule"
+        subdir.mkdir()
+
+        with patch("rhiza_hooks.check_python_version.Path.cwd", return_value=subdir):
+            assert find_repo_root() == tmp_path
+            (subdir / ".git").write_text("gitdir: /elsewhere\n")
+            stat = subdir.stat()
+            os.utime(subdir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            assert find_repo_root() == subdir
+
 
 class TestMain:
     """Tests for main function."""
@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import json
+import os
+import runpy
 from pathlib import Path
 from textwrap import dedent
+from unittest.mock import patch
 
 import pytest
+import yaml
 
-from rhiza_hooks.check_rhiza_config import main, validate_rhiza_config
+from rhiza_hooks.check_rhiza_config import _cache_file, main, validate_rhiza_config, yaml_loader
 
 
 @pytest.fixture
@@ -133,6 +138,14 @@ class TestValidateRhizaConfig:
         errors = validate_rhiza_config(config)
         assert len(errors) > 0
 
+    @pytest.mark.parametrize("content", ["", "\n  \n"])
+    def test_blank_file_skips_yaml_parse(self, temp_config, content: str):
+        """Blank files are reported as empty without invoking the parser."""
+        config = temp_config(content)
+        with patch("rhiza_hooks.check_rhiza_config.yaml_loader") as mock_loader:
+            assert validate_rhiza_config(config) == ["Configuration file is empty"]
+        mock_loader.assert_not_called()
+
     def test_file_not_found(self, tmp_path: Path):
         """Test that missing file is reported."""
         missing = tmp_path / "nonexistent.yml"
@@ -145,6 +158,66 @@ class TestValidateRhizaConfig:
         errors = validate_rhiza_config(config)
         assert any("yaml" in e.lower() for e in errors)
 
+    def test_missing_keys_stop_validation(self, temp_config):
+        """Missing required keys are reported sorted, and nothing else is checked."""
+        config = temp_config("""
+            zeta: 1
+            include: []
+            alpha: 2
+        """)
+        errors = validate_rhiza_config(config)
+        assert errors == [
+            "Missing required key: template-branch",
+            "Missing required key: template-repository",
+        ]
+
+    def test_unknown_keys_reported_in_file_order(self, temp_config):
+        """Unknown keys keep their file order."""
+        config = temp_config("""
+            zeta: 1
+            template-repository: owner/repo
+            template-branch: main
+            include:
+              - Makefile
+            alpha: 2
+        """)
+        errors = validate_rhiza_config(config)
+        assert errors == ["Unknown key: zeta", "Unknown key: alpha"]
+
+    def test_field_errors_reported_in_order(self, temp_config):
+        """Every invalid field is reported, in a stable order."""
+        config = temp_config("""
+            template-repository: 42
+            template-branch: ""
+            include: []
+            templates: not-a-list
+            exclude: 3
+        """)
+        errors = validate_rhiza_config(config)
+        assert errors == [
+            "template-repository must be a string",
+            "template-branch cannot be empty",
+            "include list cannot be empty",
+            "templates must be a list",
+            "exclude must be a list or null",
+        ]
+
+    def test_invalid_utf8_reported_as_yaml_error(self, tmp_path: Path):
+        """Undecodable bytes are reported as invalid YAML rather than raising."""
+        config = tmp_path / "template.yml"
+        config.write_bytes(b"template-repository: \xff\xfe\n")
+        errors = validate_rhiza_config(config)
+        assert len(errors) == 1
+        assert errors[0].startswith("Invalid YAML:")
+
+    def test_utf8_bom_is_accepted(self, tmp_path: Path):
+        """A leading byte order mark does not break parsing."""
+        config = tmp_path / "template.yml"
+        config.write_bytes(
+            b"\xef\xbb\xbftemplate-repository: owner/repo\ntemplate-branch: main\ninclude:\n  - Makefile\n"
+        )
+        assert validate_rhiza_config(config) == []
+
     def test_non_dict_config(self, temp_config):
         """Test that non-dict config is reported."""
         config = temp_config("- item1\n- item2")
@@ -227,6 +300,17 @@ class TestValidateRhizaConfig:
         assert any("empty" in e.lower() for e in errors)
 
 
+class TestYamlLoader:
+    """Tests for the YAML loader selection."""
+
+    def test_prefers_libyaml_loader(self) -> None:
+        """The C loader is used whenever PyYAML was built with libyaml."""
+        if yaml.__with_libyaml__:
+            assert yaml_loader() is yaml.CSafeLoader
+        else:
+            assert yaml_loader() is yaml.SafeLoader
+
+
 class TestMain:
     """Tests for main function."""
 
@@ -249,20 +333,157 @@ class TestMain:
         captured = capsys.readouterr()
         assert len(captured.out) > 0
 
+    def test_main_duplicate_filenames_checked_once(self, temp_config, capsys: pytest.CaptureFixture[str]) -> None:
+        """A path passed more than once is only reported once."""
+        config = temp_config("invalid")
+        result = main([str(config), str(config)])
+        assert result == 1
+        captured = capsys.readouterr()
+        assert captured.out.count(f"{config}:") == 1
+
+    def test_main_reports_each_failing_file(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Errors for several files are reported together, grouped per file."""
+        first = tmp_path / "first.yml"
+        first.write_text("invalid")
+        second = tmp_path / "second.yml"
+        second.write_text("- item\n")
+
+        assert main([str(first), str(second)]) == 1
+        assert capsys.readouterr().out == (
+            f"{first}:\n  - Configuration must be a YAML mapping\n{second}:\n  - Configuration must be a YAML mapping\n"
+        )
+
     def test_main_no_files(self) -> None:
         """Main returns 0 when no files provided."""
         result = main([])
         assert result == 0
 
 
+VALID_CONFIG = """
+    template-repository: owner/repo
+    template-branch: main
+    include:
+      - Makefile
+"""
+
+
+class TestValidationCache:
+    """Tests for the persistent cache of validation results."""
+
+    def test_unchanged_valid_config_is_not_revalidated(self, temp_config) -> None:
+        """A config that passed before is skipped while its mtime and size match."""
+        config = temp_config(VALID_CONFIG)
+        assert main([str(config)]) == 0
+
+        with patch("rhiza_hooks.check_rhiza_config.validate_rhiza_config") as mock_validate:
+            assert main([str(config)]) == 0
+        mock_validate.assert_not_called()
+
+    def test_modified_config_is_revalidated(self, temp_config) -> None:
+        """Changing the file invalidates its cache entry."""
+        config = temp_config(VALID_CONFIG)
+        assert main([str(config)]) == 0
+
+        config.write_text("invalid")
+        assert main([str(config)]) == 1
+
+    def test_same_size_edit_with_new_mtime_is_revalidated(self, temp_config) -> None:
+        """An edit that keeps the size is still caught through the mtime."""
+        config = temp_config(VALID_CONFIG)
+        assert main([str(config)]) == 0
+
+        config.write_text(config.read_text().replace("owner/repo", "owner-repo"))
+        st = config.stat()
+        os.utime(config, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert main([str(config)]) == 1
+
+    def test_invalid_config_errors_are_cached(self, temp_config, capsys: pytest.CaptureFixture[str]) -> None:
+        """Errors for an unchanged file are replayed without revalidating."""
+        config = temp_config("invalid")
+        assert main([str(config)]) == 1
+        first = capsys.readouterr().out
+
+        with patch("rhiza_hooks.check_rhiza_config.validate_rhiza_config") as mock_validate:
+            assert main([str(config)]) == 1
+        mock_validate.assert_not_called()
+        assert capsys.readouterr().out == first
+
+    def test_malformed_entry_is_revalidated(self, temp_config) -> None:
+        """An entry with the right stamp but unusable errors is ignored."""
+        config = temp_config(VALID_CONFIG)
+        assert main([str(config)]) == 0
+        entries = json.loads(_cache_file().read_text())
+        entries[str(config.resolve())]["errors"] = "not a list"
+        _cache_file().write_text(json.dumps(entries))
+
+        with patch("rhiza_hooks.check_rhiza_config.validate_rhiza_config", return_value=[]) as mock_validate:
+            assert main([str(config)]) == 0
+        mock_validate.assert_called_once()
+
+    def test_missing_file_is_not_cached(self, tmp_path: Path) -> None:
+        """A path that cannot be stat'ed is validated every time and never recorded."""
+        assert main([str(tmp_path / "missing.yml")]) == 1
+        assert not _cache_file().exists()
+
+    def test_corrupt_cache_is_ignored(self, temp_config) -> None:
+        """An unreadable cache file is treated as empty and rewritten."""
+        config = temp_config(VALID_CONFIG)
+        _cache_file().write_text("{not json")
+
+        assert main([str(config)]) == 0
+        assert str(config.resolve()) in json.loads(_cache_file().read_text())
+
+    def test_entry_from_other_hook_version_is_ignored(self, temp_config) -> None:
+        """Entries recorded by a different version of the hook are revalidated."""
+        config = temp_config(VALID_CONFIG)
+        assert main([str(config)]) == 0
+
+        with (
+            patch("rhiza_hooks._cache._source_digest", return_value="0" * 16),
+            patch("rhiza_hooks.check_rhiza_config.validate_rhiza_config", return_value=[]) as mock_validate,
+        ):
+            assert main([str(config)]) == 0
+        mock_validate.assert_called_once()
+
+    def test_deleted_file_is_pruned(self, tmp_path: Path) -> None:
+        """Entries for files that no longer exist are dropped when the cache is saved."""
+        gone = tmp_path / "gone.yml"
+        gone.write_text(VALID_CONFIG)
+        assert main([str(gone)]) == 0
+        gone.unlink()
+
+        kept = tmp_path / "kept.yml"
+        kept.write_text(VALID_CONFIG)
+        assert main([str(kept)]) == 0
+        assert list(json.loads(_cache_file().read_text())) == [str(kept.resolve())]
+
+    def test_cache_keeps_newest_entries(self, tmp_path: Path) -> None:
+        """Beyond the entry cap the oldest results are dropped."""
+        configs = []
+        for i in range(3):
+            config = tmp_path / f"config{i}.yml"
+            config.write_text(VALID_CONFIG)
+            configs.append(config)
+
+        with patch("rhiza_hooks._cache.MAX_ENTRIES", 2):
+            assert main([str(config) for config in configs]) == 0
+        assert list(json.loads(_cache_file().read_text())) == [str(c.resolve()) for c in configs[1:]]
+
+    def test_unwritable_cache_dir_does_not_fail(self, temp_config, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Failing to save the cache never fails the hook."""
+        config = temp_config(VALID_CONFIG)
+        blocker = config.parent / "blocker"
+        blocker.write_text("")
+        monkeypatch.setenv("RHIZA_HOOKS_CACHE_DIR", str(blocker / "cache"))
+
+        assert main([str(config)]) == 0
+
+
 class TestModuleExecution:
     """Tests for module execution via if __name__ == '__main__'."""
 
     def test_module_executes_main(self) -> None:
         """Module execution calls main and exits with its return value."""
-        import runpy
-        from unittest.mock import patch
-
         with (
             patch("rhiza_hooks.check_rhiza_config.sys.argv", ["check_rhiza_config"]),
             patch("rhiza_hooks.check_rhiza_config.sys.exit") as mock_exit,
@@ -2,20 +2,33 @@
 
 from __future__ import annotations
 
+import json
+import os
+import runpy
+import sys
 from pathlib import Path
 from textwrap import dedent
+from unittest.mock import patch
+from urllib.error import HTTPError, URLError
+from urllib.parse import ParseResult
 
 import pytest
+import yaml
 
 from rhiza_hooks.check_template_bundles import (
+    _bundles_cache_file,
+    _fetch_remote_bundles,
     _get_templates_from_config,
     _load_yaml_file,
     _validate_bundle_structure,
+    _validate_bundles_data,
     _validate_examples,
     _validate_metadata,
     _validate_top_level_fields,
     find_repo_root,
+    main,
     validate_template_bundles,
+    yaml_loader,
 )
 
 
@@ -31,7 +44,7 @@ def temp_bundles_file(tmp_path: Path):
     return _create
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def valid_bundles_content() -> str:
     """Return valid bundles content for testing."""
     return """
@@ -44,6 +57,34 @@ bundles:
 """
 
 
+@pytest.fixture(scope="session")
+def valid_bundles_file(tmp_path_factory: pytest.TempPathFactory, valid_bundles_content: str) -> Path:
+    """Write the valid bundles content once for tests that only read it."""
+    bundles_file = tmp_path_factory.mktemp("shared-bundles") / "template-bundles.yml"
+    bundles_file.write_text(dedent(valid_bundles_content))
+    return bundles_file
+
+
+class _FakeResponse:
+    """Minimal stand-in for the response object returned by urlopen."""
+
+    def __init__(self, body: bytes, headers: dict[str, str] | None = None) -> None:
+        """Serve ``body`` with the given response headers."""
+        self._body = body
+        self.headers = headers or {}
+
+    def read(self) -> bytes:
+        """Return the whole response body."""
+        return self._body
+
+    def __enter__(self) -> _FakeResponse:
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Exit the context manager without suppressing errors."""
+
+
 class TestLoadYamlFile:
     """Tests for _load_yaml_file function."""
 
@@ -65,6 +106,22 @@ class TestLoadYamlFile:
         assert success is False
         assert any("not found" in e.lower() for e in errors)
 
+    def test_load_path_under_a_file(self, tmp_path: Path):
+        """A path whose parent is a file is reported as not found instead of raising."""
+        parent = tmp_path / "not-a-dir"
+        parent.write_text("")
+        success, errors = _load_yaml_file(parent / "template-bundles.yml")
+        assert success is False
+        assert errors == [f"Template bundles file not found: {parent / 'template-bundles.yml'}"]
+
+    def test_load_unreadable_path(self, tmp_path: Path):
+        """A stat failure such as PermissionError is reported as not found instead of raising."""
+        bundles_file = tmp_path / "template-bundles.yml"
+        with patch.object(Path, "stat", side_effect=PermissionError):
+            success, errors = _load_yaml_file(bundles_file)
+        assert success is False
+        assert any("not found" in e.lower() for e in errors)
+
     def test_load_invalid_yaml(self, temp_bundles_file):
         """Test loading invalid YAML."""
         bundles_file = temp_bundles_file("invalid: yaml: syntax:")
@@ -72,6 +129,14 @@ class TestLoadYamlFile:
         assert success is False
         assert any("yaml" in e.lower() for e in errors)
 
+    def test_load_utf16_file(self, tmp_path: Path):
+        """The file encoding is detected from its bytes, not the locale."""
+        bundles_file = tmp_path / "template-bundles.yml"
+        bundles_file.write_bytes("version: 1.0\nbundles:\n  café: {}\n".encode("utf-16"))
+        success, data = _load_yaml_file(bundles_file)
+        assert success is True
+        assert "café" in data["bundles"]
+
     def test_load_empty_file(self, temp_bundles_file):
         """Test loading empty file."""
         bundles_file = temp_bundles_file("")
@@ -79,6 +144,99 @@ class TestLoadYamlFile:
         assert success is False
         assert any("empty" in e.lower() for e in errors)
 
+    def test_modified_file_is_reparsed(self, temp_bundles_file):
+        """A new modification time invalidates the cached parse."""
+        bundles_file = temp_bundles_file("version: 1.0\nbundles: {}\n")
+        _load_yaml_file(bundles_file)
+
+        bundles_file.write_text("version: 2.0\nbundles: {}\n")
+        stat = bundles_file.stat()
+        os.utime(bundles_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        success, data = _load_yaml_file(bundles_file)
+        assert success is True
+        assert data["version"] == 2.0
+
+
+class TestYamlLoader:
+    """Tests for the YAML loader selection."""
+
+    def test_prefers_libyaml_loader(self):
+        """The C loader is used whenever PyYAML was built with libyaml."""
+        if yaml.__with_libyaml__:
+            assert yaml_loader() is yaml.CSafeLoader
+        else:
+            assert yaml_loader() is yaml.SafeLoader
+
+
+class TestLoadYamlFileWithTemplates:
+    """Tests for _load_yaml_file restricted to specific templates."""
+
+    def test_only_requested_bundles_constructed(self, temp_bundles_file):
+        """Unrequested bundles keep their name but have no body."""
+        bundles_file = temp_bundles_file("""
+            version: 1.0
+            bundles:
+              core:
+                description: Core files
+                files:
+                  - .gitignore
+              python:
+                description: Python files
+                files:
+                  - pyproject.toml
+            metadata:
+              total_bundles: 2
+        """)
+        success, data = _load_yaml_file(bundles_file, {"core"})
+        assert success is True
+        assert data["version"] == 1.0
+        assert data["bundles"] == {
+            "core": {"description": "Core files", "files": [".gitignore"]},
+            "python": None,
+        }
+        assert data["metadata"] is None
+
+    def test_merge_keys_resolved(self, temp_bundles_file):
+        """Merge keys inside the bundles mapping are still honoured."""
+        bundles_file = temp_bundles_file("""
+            version: 1.0
+            defaults: &defaults
+              core:
+                description: Core files
+                files: []
+            bundles:
+              <<: *defaults
+              python:
+                description: Python files
+                files: []
+        """)
+        success, data = _load_yaml_file(bundles_file, {"core"})
+        assert success is True
+        assert set(data["bundles"]) == {"core", "python"}
+        assert data["bundles"]["core"] == {"description": "Core files", "files": []}
+
+    def test_non_mapping_document(self, temp_bundles_file):
+        """A document that isn't a mapping is constructed as-is."""
+        bundles_file = temp_bundles_file("- item1\n- item2")
+        success, data = _load_yaml_file(bundles_file, {"core"})
+        assert success is True
+        assert data == ["item1", "item2"]
+
+    def test_empty_file(self, temp_bundles_file):
+        """An empty file is still reported as empty."""
+        bundles_file = temp_bundles_file("")
+        success, errors = _load_yaml_file(bundles_file, {"core"})
+        assert success is False
+        assert any("empty" in e.lower() for e in errors)
+
+    def test_invalid_yaml(self, temp_bundles_file):
+        """Syntax errors are still reported."""
+        bundles_file = temp_bundles_file("invalid: yaml: syntax:")
+        success, errors = _load_yaml_file(bundles_file, {"core"})
+        assert success is False
+        assert any("yaml" in e.lower() for e in errors)
+
 
 class TestValidateTopLevelFields:
     """Tests for _validate_top_level_fields function."""
@@ -107,6 +265,13 @@ class TestValidateTopLevelFields:
         errors = _validate_top_level_fields(data)
         assert len(errors) == 2
 
+    def test_missing_fields_reported_in_order(self):
+        """Missing fields are reported in a stable order."""
+        assert _validate_top_level_fields({}) == [
+            "Missing required field: version",
+            "Missing required field: bundles",
+        ]
+
 
 class TestValidateBundleStructure:
     """Tests for _validate_bundle_structure function."""
@@ -146,65 +311,71 @@ class TestValidateBundleStructure:
         errors = _validate_bundle_structure("test", bundle_config, {"test"})
         assert any("list" in e.lower() for e in errors)
 
-    def test_valid_requires(self):
-        """Test with valid requires."""
+    @pytest.mark.parametrize("field", ["requires", "recommends"])
+    def test_valid_dependency(self, field):
+        """Test with a dependency field naming an existing bundle."""
         bundle_config = {
             "description": "Test bundle",
             "files": [".gitignore"],
-            "requires": ["core"],
+            field: ["core"],
         }
         errors = _validate_bundle_structure("test", bundle_config, {"test", "core"})
         assert errors == []
 
-    def test_requires_not_list(self):
-        """Test with requires not being a list."""
+    @pytest.mark.parametrize("field", ["requires", "recommends"])
+    def test_dependency_not_list(self, field):
+        """Test with a dependency field not being a list."""
         bundle_config = {
             "description": "Test bundle",
             "files": [".gitignore"],
-            "requires": "not-a-list",
+            field: "not-a-list",
         }
         errors = _validate_bundle_structure("test", bundle_config, {"test"})
         assert any("list" in e.lower() for e in errors)
 
-    def test_requires_nonexistent_bundle(self):
-        """Test with requires referencing non-existent bundle."""
+    @pytest.mark.parametrize("field", ["requires", "recommends"])
+    def test_dependency_nonexistent_bundle(self, field):
+        """Test with a dependency field referencing a non-existent bundle."""
         bundle_config = {
             "description": "Test bundle",
             "files": [".gitignore"],
-            "requires": ["nonexistent"],
+            field: ["nonexistent"],
         }
         errors = _validate_bundle_structure("test", bundle_config, {"test"})
         assert any("non-existent" in e.lower() for e in errors)
 
-    def test_valid_recommends(self):
-        """Test with valid recommends."""
-        bundle_config = {
-            "description": "Test bundle",
-            "files": [".gitignore"],
-            "recommends": ["makefile"],
-        }
-        errors = _validate_bundle_structure("test", bundle_config, {"test", "makefile"})
-        assert errors == []
+    def test_appends_to_given_errors(self):
+        """Errors go into the caller's list, which is also returned."""
+        errors = ["earlier error"]
+        result = _validate_bundle_structure("test", {"files": []}, {"test"}, errors)
+        assert result is errors
+        assert errors == ["earlier error", "Bundle 'test' missing 'description'"]
 
-    def test_recommends_not_list(self):
-        """Test with recommends not being a list."""
+    def test_dependency_error_messages(self):
+        """Each dependency field names itself in its error message."""
         bundle_config = {
             "description": "Test bundle",
             "files": [".gitignore"],
-            "recommends": "not-a-list",
+            "requires": ["missing-a"],
+            "recommends": ["missing-b"],
         }
         errors = _validate_bundle_structure("test", bundle_config, {"test"})
-        assert any("list" in e.lower() for e in errors)
+        assert errors == [
+            "Bundle 'test' requires non-existent bundle 'missing-a'",
+            "Bundle 'test' recommends non-existent bundle 'missing-b'",
+        ]
+
+    def test_missing_fields_skip_dependency_checks(self):
+        """Dependencies of a bundle lacking required fields are not checked."""
+        bundle_config = {"files": [], "requires": ["nonexistent"], "recommends": "not-a-list"}
+        errors = _validate_bundle_structure("test", bundle_config, {"test"})
+        assert errors == ["Bundle 'test' missing 'description'"]
 
-    def test_recommends_nonexistent_bundle(self):
-        """Test with recommends referencing non-existent bundle."""
-        bundle_config = {
-            "description": "Test bundle",
-            "files": [".gitignore"],
-            "recommends": ["nonexistent"],
-        }
+    def test_null_files_is_not_missing(self):
+        """A files key set to null is reported as the wrong type, not as missing."""
+        bundle_config = {"description": "Test bundle", "files": None}
         errors = _validate_bundle_structure("test", bundle_config, {"test"})
-        assert any("non-existent" in e.lower() for e in errors)
+        assert errors == ["Bundle 'test' 'files' must be a list"]
 
 
 class TestValidateExamples:
@@ -280,6 +451,44 @@ class TestValidateMetadata:
         errors = _validate_metadata(metadata, bundles)
         assert errors == []
 
+    def test_appends_to_given_errors(self):
+        """Errors go into the caller's list."""
+        errors = ["earlier error"]
+        _validate_metadata({"total_bundles": 3}, {"bundle1": {}}, errors)
+        assert len(errors) == 2
+        assert errors[0] == "earlier error"
+
+
+class TestValidateBundlesData:
+    """Tests for _validate_bundles_data on already-parsed documents."""
+
+    VALID = {
+        "version": 1.0,
+        "bundles": {
+            "core": {"description": "Core files", "files": [".gitignore"]},
+            "python": {"description": "Python files", "requires": ["core"], "files": ["pyproject.toml"]},
+        },
+        "examples": {"basic": {"templates": ["core", "python"]}},
+        "metadata": {"total_bundles": 2},
+    }
+
+    def test_valid_document(self):
+        """A well-formed document has no errors."""
+        assert _validate_bundles_data(self.VALID) == []
+
+    def test_top_level_errors_stop_validation(self):
+        """Missing top-level fields are reported on their own."""
+        assert _validate_bundles_data({"bundles": {"core": {}}}) == ["Missing required field: version"]
+
+    def test_bundles_must_be_mapping(self):
+        """A non-mapping bundles section is rejected."""
+        assert _validate_bundles_data({"version": 1.0, "bundles": []}) == ["'bundles' must be a dictionary"]
+
+    def test_selected_templates(self):
+        """Only the requested templates are checked, and unknown ones are reported."""
+        errors = _validate_bundles_data(self.VALID, {"core", "rust"})
+        assert errors == ["Template 'rust' specified in .rhiza/template.yml not found in bundles"]
+
 
 class TestValidateTemplateBundles:
     """Tests for validate_template_bundles function."""
@@ -402,24 +611,45 @@ class TestValidateTemplateBundles:
         assert success is False
         assert any("doesn't match" in e.lower() for e in errors)
 
+    def test_bundle_errors_follow_file_order(self, temp_bundles_file):
+        """Bundles are validated in the order they appear in the file."""
+        bundles_file = temp_bundles_file("""
+            version: 1.0
+            bundles:
+              zeta:
+                files: []
+              alpha:
+                files: []
+              mid:
+                files: []
+        """)
+        _success, errors = validate_template_bundles(bundles_file)
+        assert errors == [
+            "Bundle 'zeta' missing 'description'",
+            "Bundle 'alpha' missing 'description'",
+            "Bundle 'mid' missing 'description'",
+        ]
+
+    def test_dependency_check_accepts_dict_keys(self):
+        """Bundle names can be passed as a dict keys view."""
+        bundles = {"core": {}, "python": {}}
+        errors = _validate_bundle_structure(
+            "python", {"description": "d", "files": [], "requires": ["core", "rust"]}, bundles.keys()
+        )
+        assert errors == ["Bundle 'python' requires non-existent bundle 'rust'"]
+
 
 class TestMain:
     """Tests for main function."""
 
-    def test_main_with_filename_argument(self, temp_bundles_file, valid_bundles_content):
+    def test_main_with_filename_argument(self, valid_bundles_file):
         """Test main function with filename passed as argument."""
-        from rhiza_hooks.check_template_bundles import main
-
-        bundles_file = temp_bundles_file(valid_bundles_content)
-
         # Test with valid file
-        result = main([str(bundles_file)])
+        result = main([str(valid_bundles_file)])
         assert result == 0
 
     def test_main_with_invalid_file(self, temp_bundles_file):
         """Test main function with invalid file - skips validation without templates field."""
-        from rhiza_hooks.check_template_bundles import main
-
         bundles_file = temp_bundles_file("""
             bundles:
               core:
@@ -433,8 +663,6 @@ class TestMain:
 
     def test_main_with_invalid_file_and_templates(self, temp_bundles_file, tmp_path, monkeypatch):
         """Test main function with invalid file when templates field exists."""
-        from rhiza_hooks.check_template_bundles import main
-
         # Create template.yml with templates field
         template_file = tmp_path / "template.yml"
         template_file.write_text("""
@@ -456,8 +684,6 @@ templates:
 
     def test_main_with_cwd_default(self, tmp_path, monkeypatch, valid_bundles_content):
         """Test main function uses current working directory when no filename provided."""
-        from rhiza_hooks.check_template_bundles import main
-
         # Create the .rhiza directory structure in tmp_path
         rhiza_dir = tmp_path / ".rhiza"
         rhiza_dir.mkdir()
@@ -488,8 +714,6 @@ templates:
 
     def test_main_with_nonexistent_default_path(self, tmp_path, monkeypatch):
         """Test main function when default path doesn't exist."""
-        from rhiza_hooks.check_template_bundles import main
-
         # Change to a directory without .rhiza/template-bundles.yml
         monkeypatch.chdir(tmp_path)
 
@@ -497,10 +721,8 @@ templates:
         result = main([])
         assert result == 0
 
-    def test_main_skips_validation_without_templates_field(self, tmp_path, monkeypatch, valid_bundles_content):
+    def test_main_skips_validation_without_templates_field(self, tmp_path, valid_bundles_content):
         """Test main function skips validation when no templates field in template.yml."""
-        from rhiza_hooks.check_template_bundles import main
-
         # Create the .rhiza directory structure in tmp_path
         rhiza_dir = tmp_path / ".rhiza"
         rhiza_dir.mkdir()
@@ -519,11 +741,8 @@ templates:
         """)
         )
 
-        # Change to the tmp_path directory
-        monkeypatch.chdir(tmp_path)
-
-        # Test with no arguments (should skip validation since no templates field)
-        result = main([])
+        # Pass the config explicitly - should skip validation since no templates field
+        result = main([str(template_file)])
         assert result == 0
 
 
@@ -546,6 +765,18 @@ class TestGetTemplatesFromConfig:
         templates = _get_templates_from_config(config_file)
         assert templates == {"core", "python"}
 
+    def test_modified_config_is_reparsed(self, tmp_path):
+        """A new modification time invalidates the cached parse."""
+        config_file = tmp_path / "template.yml"
+        config_file.write_text("templates:\n  - core\n")
+        _get_templates_from_config(config_file)
+
+        config_file.write_text("templates:\n  - docs\n")
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert _get_templates_from_config(config_file) == {"docs"}
+
     def test_get_templates_from_nonexistent_file(self, tmp_path):
         """Test with non-existent config file."""
         config_file = tmp_path / "nonexistent.yml"
@@ -606,19 +837,10 @@ class TestValidateTemplateBundlesWithTemplates:
         assert success is True
         assert errors == []
 
-    def test_validate_nonexistent_template(self, temp_bundles_file):
+    def test_validate_nonexistent_template(self, valid_bundles_file):
         """Test with non-existent template in templates list."""
-        bundles_file = temp_bundles_file("""
-            version: 1.0
-            bundles:
-              core:
-                description: Core files
-                files:
-                  - .gitignore
-        """)
-
         # Try to validate a template that doesn't exist
-        success, errors = validate_template_bundles(bundles_file, {"core", "nonexistent"})
+        success, errors = validate_template_bundles(valid_bundles_file, {"core", "nonexistent"})
         assert success is False
         assert any("nonexistent" in e.lower() for e in errors)
 
@@ -726,15 +948,11 @@ class TestModuleExecution:
     """Tests for module execution."""
 
     def test_module_executes_main(self, tmp_path, monkeypatch):
-        """Test that the module can be executed directly."""
-        import subprocess
-        import sys
-
+        """Module execution calls main and exits with its return value."""
         # Create a valid template.yml with templates field
         rhiza_dir = tmp_path / ".rhiza"
         rhiza_dir.mkdir()
-        template_file = rhiza_dir / "template.yml"
-        template_file.write_text(
+        (rhiza_dir / "template.yml").write_text(
             dedent("""
             template-repository: test/repo
             template-branch: main
@@ -743,167 +961,76 @@ class TestModuleExecution:
         """)
         )
 
-        # Create a mock script that patches _fetch_remote_bundles
-        mock_script = tmp_path / "mock_fetch.py"
-        mock_script.write_text(
-            dedent("""
-            import sys
-            from unittest.mock import patch
-
-            def mock_fetch_remote_bundles(repo, branch):
-                return True, {
-                    "version": 1.0,
-                    "bundles": {
-                        "core": {
-                            "description": "Core files",
-                            "files": [".gitignore"]
-                        }
-                    }
-                }
-
-            with patch("rhiza_hooks.check_template_bundles._fetch_remote_bundles", mock_fetch_remote_bundles):
-                from rhiza_hooks.check_template_bundles import main
-                sys.exit(main())
-        """)
-        )
+        # The re-executed module defines its own functions, so stub the network instead
+        mock_response = _FakeResponse(b"version: 1.0\nbundles:\n  core:\n    description: Core\n    files: []\n")
 
-        # Change to the tmp_path directory
         monkeypatch.chdir(tmp_path)
+        with (
+            patch("urllib.request.urlopen", return_value=mock_response),
+            patch("rhiza_hooks.check_template_bundles.sys.argv", ["check_template_bundles"]),
+            patch("rhiza_hooks.check_template_bundles.sys.exit") as mock_exit,
+        ):
+            runpy.run_module("rhiza_hooks.check_template_bundles", run_name="__main__")
+            mock_exit.assert_called_once_with(0)
 
-        # Execute the mock script
-        result = subprocess.run(
-            [sys.executable, str(mock_script)],
-            capture_output=True,
-            text=True,
-        )
-
-        assert result.returncode == 0
-
-
-class TestFetchRemoteBundles:
-    """Tests for _fetch_remote_bundles function."""
-
-    def test_fetch_remote_bundles_http_404(self, monkeypatch):
-        """Test fetching remote bundles returns 404 error."""
-        from urllib.error import HTTPError
-
-        from rhiza_hooks.check_template_bundles import _fetch_remote_bundles
-
-        def mock_urlopen(url, timeout):
-            raise HTTPError(url, 404, "Not Found", {}, None)
-
-        monkeypatch.setattr("rhiza_hooks.check_template_bundles.urlopen", mock_urlopen)
-
-        success, errors = _fetch_remote_bundles("test/repo", "main")
-        assert success is False
-        assert any("not found" in e.lower() for e in errors)
-
-    def test_fetch_remote_bundles_http_error_non_404(self, monkeypatch):
-        """Test fetching remote bundles with non-404 HTTP error."""
-        from urllib.error import HTTPError
-
-        from rhiza_hooks.check_template_bundles import _fetch_remote_bundles
-
-        def mock_urlopen(url, timeout):
-            raise HTTPError(url, 500, "Internal Server Error", {}, None)
-
-        monkeypatch.setattr("rhiza_hooks.check_template_bundles.urlopen", mock_urlopen)
-
-        success, errors = _fetch_remote_bundles("test/repo", "main")
-        assert success is False
-        assert any("500" in e for e in errors)
-
-    def test_fetch_remote_bundles_url_error(self, monkeypatch):
-        """Test fetching remote bundles with URL error."""
-        from urllib.error import URLError
-
-        from rhiza_hooks.check_template_bundles import _fetch_remote_bundles
 
-        def mock_urlopen(url, timeout):
-            msg = "Connection refused"
-            raise URLError(msg)
-
-        monkeypatch.setattr("rhiza_hooks.check_template_bundles.urlopen", mock_urlopen)
-
-        success, errors = _fetch_remote_bundles("test/repo", "main")
-        assert success is False
-        assert any("error fetching" in e.lower() for e in errors)
-
-    def test_fetch_remote_bundles_timeout(self, monkeypatch):
-        """Test fetching remote bundles with timeout."""
-        from rhiza_hooks.check_template_bundles import _fetch_remote_bundles
-
-        def mock_urlopen(url, timeout):
-            raise TimeoutError("Timeout")
-
-        monkeypatch.setattr("rhiza_hooks.check_template_bundles.urlopen", mock_urlopen)
-
-        success, errors = _fetch_remote_bundles("test/repo", "main")
-        assert success is False
-        assert any("timeout" in e.lower() for e in errors)
-
-    def test_fetch_remote_bundles_invalid_yaml(self, monkeypatch):
-        """Test fetching remote bundles with invalid YAML."""
-        from unittest.mock import MagicMock
+@pytest.fixture
+def patch_urlopen(monkeypatch):
+    """Return a setter that replaces urlopen for the fetch under test."""
 
-        from rhiza_hooks.check_template_bundles import _fetch_remote_bundles
+    def _patch(fake):
+        # urllib.request is imported lazily by the hook, so patch it at the source
+        monkeypatch.setattr("urllib.request.urlopen", fake)
 
-        def mock_urlopen(url, timeout):
-            mock_response = MagicMock()
-            mock_response.read.return_value = b"invalid: yaml: syntax:"
-            mock_response.__enter__ = lambda self: self
-            mock_response.__exit__ = lambda self, *args: None
-            return mock_response
+    return _patch
 
-        monkeypatch.setattr("rhiza_hooks.check_template_bundles.urlopen", mock_urlopen)
 
-        success, errors = _fetch_remote_bundles("test/repo", "main")
-        assert success is False
-        assert any("invalid yaml" in e.lower() for e in errors)
-
-    def test_fetch_remote_bundles_empty_file(self, monkeypatch):
-        """Test fetching remote bundles with empty file."""
-        from unittest.mock import MagicMock
+class TestFetchRemoteBundles:
+    """Tests for _fetch_remote_bundles function."""
 
-        from rhiza_hooks.check_template_bundles import _fetch_remote_bundles
+    @pytest.mark.parametrize(
+        ("exc", "needle"),
+        [
+            pytest.param(HTTPError("", 404, "Not Found", {}, None), "not found", id="http_404"),
+            pytest.param(HTTPError("", 500, "Internal Server Error", {}, None), "500", id="http_error_non_404"),
+            pytest.param(URLError("Connection refused"), "error fetching", id="url_error"),
+            pytest.param(TimeoutError("Timeout"), "timeout", id="timeout"),
+        ],
+    )
+    def test_fetch_remote_bundles_request_error(self, patch_urlopen, exc, needle):
+        """Each kind of request failure is reported as an error message."""
 
         def mock_urlopen(url, timeout):
-            mock_response = MagicMock()
-            mock_response.read.return_value = b""
-            mock_response.__enter__ = lambda self: self
-            mock_response.__exit__ = lambda self, *args: None
-            return mock_response
+            raise exc
 
-        monkeypatch.setattr("rhiza_hooks.check_template_bundles.urlopen", mock_urlopen)
+        patch_urlopen(mock_urlopen)
 
         success, errors = _fetch_remote_bundles("test/repo", "main")
         assert success is False
-        assert any("empty" in e.lower() for e in errors)
-
-    def test_fetch_remote_bundles_not_dict(self, monkeypatch):
-        """Test fetching remote bundles that's not a dictionary."""
-        from unittest.mock import MagicMock
-
-        from rhiza_hooks.check_template_bundles import _fetch_remote_bundles
+        assert any(needle in e.lower() for e in errors)
+
+    @pytest.mark.parametrize(
+        ("body", "needle"),
+        [
+            pytest.param(b"invalid: yaml: syntax:", "invalid yaml", id="invalid_yaml"),
+            pytest.param(b"", "empty", id="empty_file"),
+            pytest.param(b"- item1\n- item2", "dictionary", id="not_dict"),
+        ],
+    )
+    def test_fetch_remote_bundles_bad_body(self, patch_urlopen, body, needle):
+        """A response body that is not a bundles mapping is rejected."""
 
         def mock_urlopen(url, timeout):
-            mock_response = MagicMock()
-            mock_response.read.return_value = b"- item1\n- item2"
-            mock_response.__enter__ = lambda self: self
-            mock_response.__exit__ = lambda self, *args: None
-            return mock_response
+            return _FakeResponse(body)
 
-        monkeypatch.setattr("rhiza_hooks.check_template_bundles.urlopen", mock_urlopen)
+        patch_urlopen(mock_urlopen)
 
         success, errors = _fetch_remote_bundles("test/repo", "main")
         assert success is False
-        assert any("dictionary" in e.lower() for e in errors)
+        assert any(needle in e.lower() for e in errors)
 
     def test_fetch_remote_bundles_invalid_scheme(self, monkeypatch):
         """Test fetching remote bundles with invalid URL scheme."""
-        from urllib.parse import ParseResult
-
-        from rhiza_hooks.check_template_bundles import _fetch_remote_bundles
 
         def mock_urlparse(url):
             # Return a parsed URL with http scheme instead of https
@@ -911,28 +1038,21 @@ class TestFetchRemoteBundles:
                 scheme="http", netloc="raw.githubusercontent.com", path="", params="", query="", fragment=""
             )
 
-        monkeypatch.setattr("rhiza_hooks.check_template_bundles.urlparse", mock_urlparse)
+        monkeypatch.setattr("urllib.parse.urlparse", mock_urlparse)
 
         success, errors = _fetch_remote_bundles("test/repo", "main")
         assert success is False
         assert any("invalid url scheme" in e.lower() for e in errors)
 
-    def test_fetch_remote_bundles_success(self, monkeypatch):
+    def test_fetch_remote_bundles_success(self, patch_urlopen):
         """Test successful fetching of remote bundles."""
-        from unittest.mock import MagicMock
-
-        from rhiza_hooks.check_template_bundles import _fetch_remote_bundles
 
         def mock_urlopen(url, timeout):
-            mock_response = MagicMock()
-            mock_response.read.return_value = (
+            return _FakeResponse(
                 b"version: 1.0\nbundles:\n  core:\n    description: Core\n    files:\n      - .gitignore"
             )
-            mock_response.__enter__ = lambda self: self
-            mock_response.__exit__ = lambda self, *args: None
-            return mock_response
 
-        monkeypatch.setattr("rhiza_hooks.check_template_bundles.urlopen", mock_urlopen)
+        patch_urlopen(mock_urlopen)
 
         success, data = _fetch_remote_bundles("test/repo", "main")
         assert success is True
@@ -941,221 +1061,148 @@ class TestFetchRemoteBundles:
         assert "bundles" in data
 
 
-class TestMainErrorPaths:
-    """Tests for main function error paths."""
-
-    def test_main_missing_template_repository(self, tmp_path, monkeypatch):
-        """Test main function when template-repository is missing."""
-        from rhiza_hooks.check_template_bundles import main
-
-        # Create the .rhiza directory structure
-        rhiza_dir = tmp_path / ".rhiza"
-        rhiza_dir.mkdir()
-
-        # Create template.yml with templates but missing template-repository
-        template_file = rhiza_dir / "template.yml"
-        template_file.write_text(
-            dedent("""
-            template-branch: main
-            templates:
-              - core
-        """)
-        )
-
-        # Change to the tmp_path directory
-        monkeypatch.chdir(tmp_path)
-
-        # Test with no arguments - should fail due to missing template-repository
-        result = main([])
-        assert result == 1
-
-    def test_main_missing_template_branch(self, tmp_path, monkeypatch):
-        """Test main function when template-branch is missing."""
-        from rhiza_hooks.check_template_bundles import main
+class TestFetchRemoteBundlesCache:
+    """Tests for the ETag cache behind _fetch_remote_bundles."""
 
-        # Create the .rhiza directory structure
-        rhiza_dir = tmp_path / ".rhiza"
-        rhiza_dir.mkdir()
-
-        # Create template.yml with templates but missing template-branch
-        template_file = rhiza_dir / "template.yml"
-        template_file.write_text(
-            dedent("""
-            template-repository: test/repo
-            templates:
-              - core
-        """)
-        )
+    BODY = b"version: 1.0\nbundles:\n  core:\n    description: Core\n    files:\n      - .gitignore\n"
 
-        # Change to the tmp_path directory
-        monkeypatch.chdir(tmp_path)
+    def test_etag_response_is_cached_and_revalidated(self, patch_urlopen):
+        """A 304 on the second fetch reuses the body stored with the ETag."""
+        sent_headers = []
 
-        # Test with no arguments - should fail due to missing template-branch
-        result = main([])
-        assert result == 1
+        def mock_urlopen(request, timeout):
+            sent_headers.append(request.get_header("If-none-match"))
+            if len(sent_headers) == 1:
+                return _FakeResponse(self.BODY, {"ETag": '"abc"'})
+            raise HTTPError(request.full_url, 304, "Not Modified", {}, None)
 
-    def test_main_fetch_remote_fails(self, tmp_path, monkeypatch):
-        """Test main function when fetching remote bundles fails."""
-        from rhiza_hooks.check_template_bundles import main
+        patch_urlopen(mock_urlopen)
 
-        # Create the .rhiza directory structure
-        rhiza_dir = tmp_path / ".rhiza"
-        rhiza_dir.mkdir()
+        first = _fetch_remote_bundles("test/repo", "main")
+        second = _fetch_remote_bundles("test/repo", "main")
 
-        # Create template.yml with templates field
-        template_file = rhiza_dir / "template.yml"
-        template_file.write_text(
-            dedent("""
-            template-repository: test/repo
-            template-branch: main
-            templates:
-              - core
-        """)
-        )
+        assert sent_headers == [None, '"abc"']
+        assert first == second
+        assert second[0] is True
 
-        # Mock _fetch_remote_bundles to return failure
-        def mock_fetch_remote_bundles(repo, branch):
-            return False, ["Failed to fetch remote bundles"]
+    def test_response_without_etag_is_not_cached(self, patch_urlopen):
+        """Without an ETag nothing is stored and no conditional request is made."""
+        sent_headers = []
 
-        monkeypatch.setattr("rhiza_hooks.check_template_bundles._fetch_remote_bundles", mock_fetch_remote_bundles)
+        def mock_urlopen(request, timeout):
+            sent_headers.append(request.get_header("If-none-match"))
+            return _FakeResponse(self.BODY)
 
-        # Change to the tmp_path directory
-        monkeypatch.chdir(tmp_path)
+        patch_urlopen(mock_urlopen)
 
-        # Test with no arguments - should fail
-        result = main([])
-        assert result == 1
+        _fetch_remote_bundles("test/repo", "main")
+        _fetch_remote_bundles("test/repo", "main")
 
-    def test_main_bundles_not_dict(self, tmp_path, monkeypatch):
-        """Test main function when bundles is not a dict in remote data."""
-        from rhiza_hooks.check_template_bundles import main
+        assert sent_headers == [None, None]
+        assert not _bundles_cache_file().exists()
 
-        # Create the .rhiza directory structure
-        rhiza_dir = tmp_path / ".rhiza"
-        rhiza_dir.mkdir()
+    def test_not_modified_without_cache_is_an_error(self, patch_urlopen):
+        """A 304 with nothing cached is reported like any other HTTP error."""
 
-        # Create template.yml with templates field
-        template_file = rhiza_dir / "template.yml"
-        template_file.write_text(
-            dedent("""
-            template-repository: test/repo
-            template-branch: main
-            templates:
-              - core
-        """)
-        )
+        def mock_urlopen(request, timeout):
+            raise HTTPError(request.full_url, 304, "Not Modified", {}, None)
 
-        # Mock _fetch_remote_bundles to return bundles as a list instead of dict
-        def mock_fetch_remote_bundles(repo, branch):
-            return True, {"version": 1.0, "bundles": []}
+        patch_urlopen(mock_urlopen)
 
-        monkeypatch.setattr("rhiza_hooks.check_template_bundles._fetch_remote_bundles", mock_fetch_remote_bundles)
+        success, errors = _fetch_remote_bundles("test/repo", "main")
+        assert success is False
+        assert errors == ["HTTP error fetching template bundles: 304 Not Modified"]
 
-        # Change to the tmp_path directory
-        monkeypatch.chdir(tmp_path)
+    def test_malformed_cache_entry_is_ignored(self, patch_urlopen):
+        """A cache entry missing its body does not produce a conditional request."""
+        url = "https://raw.githubusercontent.com/test/repo/main/.rhiza/template-bundles.yml"
+        _bundles_cache_file().write_text(json.dumps({url: {"etag": '"abc"'}}))
+        sent_headers = []
 
-        # Test with no arguments - should fail
-        result = main([])
-        assert result == 1
+        def mock_urlopen(request, timeout):
+            sent_headers.append(request.get_header("If-none-match"))
+            return _FakeResponse(self.BODY, {"ETag": '"def"'})
 
-    def test_main_template_not_in_bundles(self, tmp_path, monkeypatch):
-        """Test main function when requested template is not in remote bundles."""
-        from rhiza_hooks.check_template_bundles import main
+        patch_urlopen(mock_urlopen)
 
-        # Create the .rhiza directory structure
-        rhiza_dir = tmp_path / ".rhiza"
-        rhiza_dir.mkdir()
+        success, _data = _fetch_remote_bundles("test/repo", "main")
+        assert success is True
+        assert sent_headers == [None]
+        assert json.loads(_bundles_cache_file().read_text())[url]["etag"] == '"def"'
 
-        # Create template.yml with templates field
-        template_file = rhiza_dir / "template.yml"
-        template_file.write_text(
-            dedent("""
-            template-repository: test/repo
-            template-branch: main
-            templates:
-              - core
-              - nonexistent
-        """)
-        )
 
-        # Mock _fetch_remote_bundles to return bundles without the requested template
-        def mock_fetch_remote_bundles(repo, branch):
-            return True, {
-                "version": 1.0,
-                "bundles": {"core": {"description": "Core files", "files": [".gitignore"]}},
-            }
+# A config naming only the core template
+_CORE_CONFIG = """
+    template-repository: test/repo
+    template-branch: main
+    templates:
+      - core
+"""
 
-        monkeypatch.setattr("rhiza_hooks.check_template_bundles._fetch_remote_bundles", mock_fetch_remote_bundles)
 
-        # Change to the tmp_path directory
-        monkeypatch.chdir(tmp_path)
+class TestMainErrorPaths:
+    """Tests for main function error paths."""
 
-        # Test with no arguments - should fail
-        result = main([])
+    @pytest.fixture
+    def temp_template_file(self, tmp_path: Path):
+        """Return a factory writing .rhiza/template.yml under a fresh directory."""
+
+        def _create(content: str) -> Path:
+            rhiza_dir = tmp_path / ".rhiza"
+            rhiza_dir.mkdir()
+            template_file = rhiza_dir / "template.yml"
+            template_file.write_text(dedent(content))
+            return template_file
+
+        return _create
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            pytest.param("template-branch: main\ntemplates:\n  - core\n", id="missing-template-repository"),
+            pytest.param("template-repository: test/repo\ntemplates:\n  - core\n", id="missing-template-branch"),
+        ],
+    )
+    def test_main_missing_template_source(self, temp_template_file, content):
+        """Test main function when template-repository or template-branch is missing."""
+        result = main([str(temp_template_file(content))])
         assert result == 1
 
-    def test_main_invalid_bundle_structure_in_remote(self, tmp_path, monkeypatch):
-        """Test main function when remote bundle has invalid structure."""
-        from rhiza_hooks.check_template_bundles import main
-
-        # Create the .rhiza directory structure
-        rhiza_dir = tmp_path / ".rhiza"
-        rhiza_dir.mkdir()
-
-        # Create template.yml with templates field
-        template_file = rhiza_dir / "template.yml"
-        template_file.write_text(
-            dedent("""
-            template-repository: test/repo
-            template-branch: main
-            templates:
-              - core
-        """)
-        )
+    @pytest.mark.parametrize(
+        ("content", "fetch_result"),
+        [
+            pytest.param(_CORE_CONFIG, (False, ["Failed to fetch remote bundles"]), id="fetch-fails"),
+            pytest.param(_CORE_CONFIG, (True, {"version": 1.0, "bundles": []}), id="bundles-not-dict"),
+            pytest.param(
+                _CORE_CONFIG + "      - nonexistent\n",
+                (True, {"version": 1.0, "bundles": {"core": {"description": "Core files", "files": [".gitignore"]}}}),
+                id="template-not-in-bundles",
+            ),
+            pytest.param(
+                _CORE_CONFIG,
+                (True, {"version": 1.0, "bundles": {"core": {"files": [".gitignore"]}}}),
+                id="invalid-bundle-structure",
+            ),
+        ],
+    )
+    def test_main_remote_bundles_rejected(self, temp_template_file, monkeypatch, content, fetch_result):
+        """Test main function fails when the remote bundles cannot satisfy the config."""
+        template_file = temp_template_file(content)
 
-        # Mock _fetch_remote_bundles to return invalid bundle structure (missing description)
         def mock_fetch_remote_bundles(repo, branch):
-            return True, {"version": 1.0, "bundles": {"core": {"files": [".gitignore"]}}}
+            return fetch_result
 
         monkeypatch.setattr("rhiza_hooks.check_template_bundles._fetch_remote_bundles", mock_fetch_remote_bundles)
 
-        # Change to the tmp_path directory
-        monkeypatch.chdir(tmp_path)
-
-        # Test with no arguments - should fail
-        result = main([])
+        result = main([str(template_file)])
         assert result == 1
 
 
 class TestMainNameBlock:
     """Tests for the if __name__ == '__main__' block."""
 
-    def test_main_name_block_execution(self, tmp_path):
-        """Test that the module can be run as __main__."""
-        import subprocess
-        import sys
-
-        # Create a temporary directory with a .rhiza/template.yml that won't trigger validation
-        rhiza_dir = tmp_path / ".rhiza"
-        rhiza_dir.mkdir()
-        template_file = rhiza_dir / "template.yml"
-        template_file.write_text("# No templates field")
-
-        # Run the module as __main__ using python -m
-        result = subprocess.run(
-            [sys.executable, "-m", "rhiza_hooks.check_template_bundles"],
-            cwd=tmp_path,
-            capture_output=True,
-            text=True,
-        )
-
-        assert result.returncode == 0
-
     def test_main_name_block_with_runpy(self, tmp_path, monkeypatch):
         """Test the __main__ block using runpy to maintain coverage."""
-        import runpy
-        import sys
-
         # Create a temporary directory with a .rhiza/template.yml that won't trigger validation
         rhiza_dir = tmp_path / ".rhiza"
         rhiza_dir.mkdir()
@@ -5,11 +5,23 @@ Migrated from rhiza's tests/test_rhiza/test_check_workflow_names.py
 
 from __future__ import annotations
 
+import json
+import os
+import runpy
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
+import yaml
 
-from rhiza_hooks.check_workflow_names import check_file, main
+from rhiza_hooks.check_workflow_names import (
+    _cache_file,
+    _expected_name,
+    _has_expected_name,
+    check_file,
+    main,
+    yaml_loader,
+)
 
 
 class TestCheckFile:
@@ -90,6 +102,30 @@ jobs:
         assert "runs-on: ubuntu-latest" in content
         assert "actions/checkout@v4" in content
 
+    def test_non_ascii_name_is_updated(self, tmp_path: Path) -> None:
+        """UTF-8 workflow files are parsed and rewritten without mangling."""
+        workflow = tmp_path / "workflow.yml"
+        workflow.write_bytes("name: Café déploiement\non: push\n# héllo\n".encode())
+
+        assert check_file(str(workflow)) is False
+        assert workflow.read_bytes().decode() == 'name: "(RHIZA) CAFÉ DÉPLOIEMENT"\non: push\n# héllo\n'
+
+    def test_crlf_line_endings_preserved(self, tmp_path: Path) -> None:
+        """Rewriting the name line keeps the file's CRLF line endings."""
+        workflow = tmp_path / "workflow.yml"
+        workflow.write_bytes(b"# header\r\nname: ci\r\non: push\r\n")
+
+        assert check_file(str(workflow)) is False
+        assert workflow.read_bytes() == b'# header\r\nname: "(RHIZA) CI"\r\non: push\r\n'
+
+    def test_only_first_top_level_name_line_rewritten(self, tmp_path: Path) -> None:
+        """Indented name fields further down are left alone."""
+        workflow = tmp_path / "workflow.yml"
+        workflow.write_text("name: ci\njobs:\n  test:\n    name: unit tests\n")
+
+        assert check_file(str(workflow)) is False
+        assert workflow.read_text() == 'name: "(RHIZA) CI"\njobs:\n  test:\n    name: unit tests\n'
+
     def test_quoted_name_with_prefix(self, tmp_path: Path) -> None:
         """File with quoted name containing prefix returns True."""
         workflow = tmp_path / "workflow.yml"
@@ -114,6 +150,68 @@ jobs:
         content = workflow.read_text()
         assert "(RHIZA) BUILD & DEPLOY" in content
 
+    @pytest.mark.parametrize(
+        "text",
+        [
+            pytest.param("name: (RHIZA) CI\non: [push\njobs:\n", id="unclosed-flow"),
+            pytest.param("- a\nname: (RHIZA) CI\n", id="sequence-then-mapping"),
+            pytest.param("%YAML 1.1\nname: (RHIZA) CI\n", id="directive-without-document"),
+            pytest.param("name: (RHIZA) CI\nname2: x\n  bad: indent\n", id="bad-indent"),
+            pytest.param("name: (RHIZA) CI\n\n  # c\n  more\n", id="stray-continuation"),
+            pytest.param("name: (RHIZA) CI\x0con: push\n", id="form-feed"),
+            pytest.param("name: (RHIZA) CI\x1con: push\n", id="file-separator"),
+        ],
+    )
+    def test_invalid_yaml_with_correct_name_returns_false(
+        self, tmp_path: Path, text: str, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """A correct name never hides a file PyYAML rejects."""
+        workflow = tmp_path / "workflow.yml"
+        workflow.write_bytes(text.encode())
+
+        assert check_file(str(workflow)) is False
+        assert "Error parsing YAML" in capsys.readouterr().out
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            pytest.param("on: push\nenv: {\nname: (RHIZA) X}\n", id="flow-mapping"),
+            pytest.param('description: "abc\nname: (RHIZA) X"\non: push\n', id="multi-line-quoted"),
+        ],
+    )
+    def test_name_inside_earlier_scalar_is_not_top_level(
+        self, tmp_path: Path, text: str, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """A name line inside a collection or scalar opened above is not the workflow name."""
+        workflow = tmp_path / "workflow.yml"
+        workflow.write_text(text)
+
+        assert check_file(str(workflow)) is False
+        assert "missing 'name' field" in capsys.readouterr().out
+
+
+class TestHasExpectedName:
+    """Tests for the in-place expected name check."""
+
+    @pytest.mark.parametrize(
+        "name",
+        ["(RHIZA) CI", "(RHIZA) ci", "(rhiza) CI", "CI", "(RHIZA) 123", "(RHIZA) ", "(RHIZA) straße"],
+    )
+    def test_agrees_with_expected_name(self, name: str) -> None:
+        """The check matches comparing against the built expected name."""
+        assert _has_expected_name(name) is (name == _expected_name(name))
+
+
+class TestYamlLoader:
+    """Tests for the YAML loader selection."""
+
+    def test_prefers_libyaml_loader(self) -> None:
+        """The C loader is used whenever PyYAML was built with libyaml."""
+        if yaml.__with_libyaml__:
+            assert yaml_loader() is yaml.CSafeLoader
+        else:
+            assert yaml_loader() is yaml.SafeLoader
+
 
 class TestMain:
     """Tests for main function."""
@@ -154,14 +252,61 @@ class TestMain:
         assert exc_info.value.code == 1
 
 
+class TestPassCache:
+    """Tests for the persistent record of workflows that already passed."""
+
+    def test_unchanged_valid_workflow_is_not_rechecked(self, tmp_path: Path) -> None:
+        """A workflow that passed before is skipped while its mtime and size match."""
+        workflow = tmp_path / "workflow.yml"
+        workflow.write_text('name: "(RHIZA) TEST"\non: push\n')
+        assert main([str(workflow)]) == 0
+
+        with patch("rhiza_hooks.check_workflow_names.check_file") as mock_check:
+            assert main([str(workflow)]) == 0
+        mock_check.assert_not_called()
+
+    def test_modified_workflow_is_rechecked(self, tmp_path: Path) -> None:
+        """An edit that keeps the size is still caught through the mtime."""
+        workflow = tmp_path / "workflow.yml"
+        workflow.write_text('name: "(RHIZA) TEST"\non: push\n')
+        assert main([str(workflow)]) == 0
+
+        workflow.write_text('name: "(RHIZA) test"\non: push\n')
+        st = workflow.stat()
+        os.utime(workflow, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        with pytest.raises(SystemExit):
+            main([str(workflow)])
+        assert "(RHIZA) TEST" in workflow.read_text()
+
+    def test_failing_workflow_is_not_recorded(self, tmp_path: Path) -> None:
+        """Files that fail are checked again on every run."""
+        workflow = tmp_path / "workflow.yml"
+        workflow.write_text("on: push\n")
+
+        with pytest.raises(SystemExit):
+            main([str(workflow)])
+        assert not _cache_file().exists()
+
+    def test_entry_from_other_hook_version_is_ignored(self, tmp_path: Path) -> None:
+        """Entries recorded by a different version of the hook are rechecked."""
+        workflow = tmp_path / "workflow.yml"
+        workflow.write_text('name: "(RHIZA) TEST"\non: push\n')
+        assert main([str(workflow)]) == 0
+
+        with (
+            patch("rhiza_hooks._cache._source_digest", return_value="0" * 16),
+            patch("rhiza_hooks.check_workflow_names.check_file", return_value=True) as mock_check,
+        ):
+            assert main([str(workflow)]) == 0
+        mock_check.assert_called_once()
+        assert str(workflow.resolve()) in json.loads(_cache_file().read_text())
+
+
 class TestModuleExecution:
     """Tests for module execution via if __name__ == '__main__'."""
 
     def test_module_executes_main(self) -> None:
         """Module execution calls main."""
-        import runpy
-        from unittest.mock import patch
-
         with patch("rhiza_hooks.check_workflow_names.sys.argv", ["check_workflow_names"]):
             # main() returns 0 when no files provided, doesn't call sys.exit
             runpy.run_module("rhiza_hooks.check_workflow_names", run_name="__main__")
@@ -11,8 +11,10 @@ This module tests the command-line entry points of all rhiza-hooks scripts:
 
 from __future__ import annotations
 
+import importlib
 import subprocess
 import sys
+from importlib.metadata import EntryPoint, entry_points
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -22,7 +24,7 @@ if TYPE_CHECKING:
     from collections.abc import Callable
 
 
-# All scripts defined in pyproject.toml [project.scripts]
+# All hook scripts defined in pyproject.toml [project.scripts]
 SCRIPTS = [
     "check-rhiza-workflow-names",
     "update-readme-help",
@@ -32,6 +34,19 @@ SCRIPTS = [
     "check-template-bundles",
 ]
 
+# Interpreter command for subprocess runs; isolated mode skips the user site and PYTHON* variables
+PYTHON = (sys.executable, "-I")
+
+# Module providing each script's main()
+SCRIPT_MODULES = {
+    "check-rhiza-workflow-names": "rhiza_hooks.check_workflow_names",
+    "update-readme-help": "rhiza_hooks.update_readme_help",
+    "check-rhiza-config": "rhiza_hooks.check_rhiza_config",
+    "check-makefile-targets": "rhiza_hooks.check_makefile_targets",
+    "check-python-version-consistency": "rhiza_hooks.check_python_version",
+    "check-template-bundles": "rhiza_hooks.check_template_bundles",
+}
+
 
 @pytest.fixture
 def project_root() -> Path:
@@ -39,6 +54,12 @@ def project_root() -> Path:
     return Path(__file__).parent.parent
 
 
+@pytest.fixture(scope="session")
+def console_scripts() -> dict[str, EntryPoint]:
+    """Return the installed console script entry points by name."""
+    return {ep.name: ep for ep in entry_points(group="console_scripts")}
+
+
 @pytest.fixture
 def mock_project(tmp_path: Path) -> Callable[[dict[str, str]], Path]:
     """Create a mock project structure for testing.
@@ -64,50 +85,30 @@ class TestScriptAvailability:
     """Test that all scripts are available as command-line tools."""
 
     @pytest.mark.parametrize("script_name", SCRIPTS)
-    def test_script_is_installed(self, script_name: str) -> None:
-        """Test that script module is importable."""
-        # Map script names to their module names
-        module_mapping = {
-            "check-rhiza-workflow-names": "rhiza_hooks.check_workflow_names",
-            "update-readme-help": "rhiza_hooks.update_readme_help",
-            "check-rhiza-config": "rhiza_hooks.check_rhiza_config",
-            "check-makefile-targets": "rhiza_hooks.check_makefile_targets",
-            "check-python-version-consistency": "rhiza_hooks.check_python_version",
-            "check-template-bundles": "rhiza_hooks.check_template_bundles",
-        }
-
-        module_name = module_mapping[script_name]
-        # Just verify the module is importable
-        result = subprocess.run(
-            [sys.executable, "-c", f"import {module_name}"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        assert result.returncode == 0, f"Failed to import {module_name}: {result.stderr}"
+    def test_script_is_installed(self, script_name: str, console_scripts: dict[str, EntryPoint]) -> None:
+        """Test that the script is installed and points at its module's main."""
+        assert script_name in console_scripts, f"{script_name} is not an installed console script"
+        assert console_scripts[script_name].value == f"{SCRIPT_MODULES[script_name]}:main"
+
+    @pytest.mark.parametrize("script_name", SCRIPTS)
+    def test_script_has_main_function(self, script_name: str, console_scripts: dict[str, EntryPoint]) -> None:
+        """Test that the script's entry point loads a main function."""
+        assert callable(console_scripts[script_name].load()), f"{script_name} entry point is not callable"
 
     @pytest.mark.parametrize("script_name", SCRIPTS)
-    def test_script_has_main_function(self, script_name: str) -> None:
-        """Test that script has a main function."""
-        # Map script names to their module names
-        module_mapping = {
-            "check-rhiza-workflow-names": "rhiza_hooks.check_workflow_names",
-            "update-readme-help": "rhiza_hooks.update_readme_help",
-            "check-rhiza-config": "rhiza_hooks.check_rhiza_config",
-            "check-makefile-targets": "rhiza_hooks.check_makefile_targets",
-            "check-python-version-consistency": "rhiza_hooks.check_python_version",
-            "check-template-bundles": "rhiza_hooks.check_template_bundles",
-        }
-
-        module_name = module_mapping[script_name]
-        # Verify the module has a main function
+    def test_script_import_defers_parsers(self, script_name: str) -> None:
+        """Test that importing a script doesn't import yaml, tomllib or urllib.request up front."""
+        # A fresh interpreter is needed so no earlier test has imported them
+        module_name = SCRIPT_MODULES[script_name]
+        deferred = "{'yaml', 'tomllib', 'urllib.request'}"
+        code = f"import sys, {module_name}; assert not {deferred} & set(sys.modules), sorted(sys.modules)"
         result = subprocess.run(
-            [sys.executable, "-c", f"import {module_name}; assert hasattr({module_name}, 'main')"],
+            [*PYTHON, "-c", code],
             capture_output=True,
             text=True,
             check=False,
         )
-        assert result.returncode == 0, f"Module {module_name} has no main function"
+        assert result.returncode == 0, f"{module_name} imported a heavy module eagerly: {result.stderr}"
 
 
 class TestCheckWorkflowNames:
@@ -118,7 +119,7 @@ class TestCheckWorkflowNames:
         project = mock_project({".github/workflows/test.yml": 'name: "(RHIZA) TEST WORKFLOW"\non: push\n'})
 
         result = subprocess.run(
-            [sys.executable, "-m", "rhiza_hooks.check_workflow_names", str(project / ".github/workflows/test.yml")],
+            [*PYTHON, "-m", "rhiza_hooks.check_workflow_names", str(project / ".github/workflows/test.yml")],
             capture_output=True,
             text=True,
             check=False,
@@ -131,7 +132,7 @@ class TestCheckWorkflowNames:
         project = mock_project({".github/workflows/test.yml": 'name: "Test Workflow"\non: push\n'})
 
         result = subprocess.run(
-            [sys.executable, "-m", "rhiza_hooks.check_workflow_names", str(project / ".github/workflows/test.yml")],
+            [*PYTHON, "-m", "rhiza_hooks.check_workflow_names", str(project / ".github/workflows/test.yml")],
             capture_output=True,
             text=True,
             check=False,
@@ -152,7 +153,7 @@ bundles: []
         project = mock_project({".rhiza/rhiza.yml": config})
 
         result = subprocess.run(
-            [sys.executable, "-m", "rhiza_hooks.check_rhiza_config"],
+            [*PYTHON, "-m", "rhiza_hooks.check_rhiza_config"],
             cwd=project,
             capture_output=True,
             text=True,
@@ -166,7 +167,7 @@ bundles: []
         project = mock_project({"dummy.txt": "test"})
 
         result = subprocess.run(
-            [sys.executable, "-m", "rhiza_hooks.check_rhiza_config"],
+            [*PYTHON, "-m", "rhiza_hooks.check_rhiza_config"],
             cwd=project,
             capture_output=True,
             text=True,
@@ -191,7 +192,7 @@ test: ## Run tests
         project = mock_project({"Makefile": makefile})
 
         result = subprocess.run(
-            [sys.executable, "-m", "rhiza_hooks.check_makefile_targets"],
+            [*PYTHON, "-m", "rhiza_hooks.check_makefile_targets"],
             cwd=project,
             capture_output=True,
             text=True,
@@ -218,7 +219,7 @@ requires-python = ">=3.11"
         )
 
         result = subprocess.run(
-            [sys.executable, "-m", "rhiza_hooks.check_python_version"],
+            [*PYTHON, "-m", "rhiza_hooks.check_python_version"],
             cwd=project,
             capture_output=True,
             text=True,
@@ -240,7 +241,7 @@ requires-python = ">=3.11"
         )
 
         result = subprocess.run(
-            [sys.executable, "-m", "rhiza_hooks.check_python_version"],
+            [*PYTHON, "-m", "rhiza_hooks.check_python_version"],
             cwd=project,
             capture_output=True,
             text=True,
@@ -271,7 +272,7 @@ bundles:
         )
 
         result = subprocess.run(
-            [sys.executable, "-m", "rhiza_hooks.check_template_bundles"],
+            [*PYTHON, "-m", "rhiza_hooks.check_template_bundles"],
             cwd=project,
             capture_output=True,
             text=True,
@@ -289,7 +290,7 @@ bundles:
         project = mock_project({".rhiza/template.yml": template})
 
         result = subprocess.run(
-            [sys.executable, "-m", "rhiza_hooks.check_template_bundles"],
+            [*PYTHON, "-m", "rhiza_hooks.check_template_bundles"],
             cwd=project,
             capture_output=True,
             text=True,
@@ -324,7 +325,7 @@ test: ## Run tests
         )
 
         result = subprocess.run(
-            [sys.executable, "-m", "rhiza_hooks.update_readme_help"],
+            [*PYTHON, "-m", "rhiza_hooks.update_readme_help"],
             cwd=project,
             capture_output=True,
             text=True,
@@ -343,25 +344,25 @@ class TestScriptsInCurrentProject:
         if not workflows_dir.exists():
             pytest.skip("No .github/workflows directory")
 
-        workflows = list(workflows_dir.glob("*.yml")) + list(workflows_dir.glob("*.yaml"))
+        # One directory listing covers both workflow suffixes
+        workflows = sorted(p for p in workflows_dir.iterdir() if p.suffix in {".yml", ".yaml"} and p.is_file())
         if not workflows:
             pytest.skip("No workflow files found")
 
-        # Just verify the script runs without crashing on actual workflows
-        for workflow in workflows:
-            result = subprocess.run(
-                [sys.executable, "-m", "rhiza_hooks.check_workflow_names", str(workflow)],
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-            # Script should complete (may return 0 or 1 if it needs to update)
-            assert result.returncode in (0, 1), f"Workflow {workflow.name} crashed: {result.stderr}"
+        # Just verify the script runs without crashing on actual workflows; one run checks them all
+        result = subprocess.run(
+            [*PYTHON, "-m", "rhiza_hooks.check_workflow_names", *map(str, workflows)],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        # Script should complete (may return 0 or 1 if it needs to update)
+        assert result.returncode in (0, 1), f"Workflow check crashed: {result.stderr}"
 
     def test_check_rhiza_config_on_project(self, project_root: Path) -> None:
         """Test check-rhiza-config on actual project."""
         result = subprocess.run(
-            [sys.executable, "-m", "rhiza_hooks.check_rhiza_config"],
+            [*PYTHON, "-m", "rhiza_hooks.check_rhiza_config"],
             cwd=project_root,
             capture_output=True,
             text=True,
@@ -373,7 +374,7 @@ class TestScriptsInCurrentProject:
     def test_check_makefile_targets_on_project(self, project_root: Path) -> None:
         """Test check-makefile-targets on actual project."""
         result = subprocess.run(
-            [sys.executable, "-m", "rhiza_hooks.check_makefile_targets"],
+            [*PYTHON, "-m", "rhiza_hooks.check_makefile_targets"],
             cwd=project_root,
             capture_output=True,
             text=True,
@@ -385,7 +386,7 @@ class TestScriptsInCurrentProject:
     def test_check_python_version_on_project(self, project_root: Path) -> None:
         """Test check-python-version-consistency on actual project."""
         result = subprocess.run(
-            [sys.executable, "-m", "rhiza_hooks.check_python_version"],
+            [*PYTHON, "-m", "rhiza_hooks.check_python_version"],
             cwd=project_root,
             capture_output=True,
             text=True,
@@ -397,7 +398,7 @@ class TestScriptsInCurrentProject:
     def test_check_template_bundles_on_project(self, project_root: Path) -> None:
         """Test check-template-bundles on actual project."""
         result = subprocess.run(
-            [sys.executable, "-m", "rhiza_hooks.check_template_bundles"],
+            [*PYTHON, "-m", "rhiza_hooks.check_template_bundles"],
             cwd=project_root,
             capture_output=True,
             text=True,
@@ -408,27 +409,86 @@ class TestScriptsInCurrentProject:
         assert result.returncode in (0, 1)
 
 
+class TestCombinedCli:
+    """Integration tests for the rhiza-hooks dispatcher."""
+
+    def test_dispatches_to_hook(self, mock_project: Callable[[dict[str, str]], Path]) -> None:
+        """Test that the selected hook runs with the remaining arguments."""
+        project = mock_project({".github/workflows/test.yml": 'name: "Test Workflow"\non: push\n'})
+
+        result = subprocess.run(
+            [*PYTHON, "-m", "rhiza_hooks", "workflow-names", str(project / ".github/workflows/test.yml")],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        assert result.returncode == 1
+        assert "(RHIZA) TEST WORKFLOW" in (project / ".github/workflows/test.yml").read_text()
+
+    def test_passes_options_through(self, mock_project: Callable[[dict[str, str]], Path]) -> None:
+        """Test that hook options after the subcommand reach the hook."""
+        project = mock_project({"Makefile": "install:\n"})
+
+        result = subprocess.run(
+            [*PYTHON, "-m", "rhiza_hooks", "makefile-targets", "--strict", str(project / "Makefile")],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        assert result.returncode == 1
+        assert "Missing recommended targets" in result.stdout
+
+    def test_manifest_hooks_use_dispatcher(self, project_root: Path) -> None:
+        """Every published hook runs a known rhiza-hooks subcommand ahead of the filenames."""
+        import shlex
+
+        import yaml
+
+        from rhiza_hooks.__main__ import HOOK_MODULES
+
+        hooks = yaml.safe_load((project_root / ".pre-commit-hooks.yaml").read_text())
+        for hook in hooks:
+            command, subcommand = shlex.split(hook["entry"])
+            assert command == "rhiza-hooks"
+            assert subcommand in HOOK_MODULES
+
+    def test_unknown_hook_is_rejected(self) -> None:
+        """Test that an unknown subcommand is a usage error."""
+        result = subprocess.run(
+            [*PYTHON, "-m", "rhiza_hooks", "no-such-hook"],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        assert result.returncode == 2
+        assert "invalid choice" in result.stderr
+
+    def test_only_selected_hook_is_imported(self) -> None:
+        """Test that dispatching imports just the chosen hook module."""
+        code = (
+            "import sys; from rhiza_hooks.__main__ import main; main(['python-version']); "
+            "assert 'rhiza_hooks.check_template_bundles' not in sys.modules"
+        )
+        result = subprocess.run(
+            [*PYTHON, "-c", code],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        assert result.returncode == 0, result.stderr
+
+
 class TestScriptErrorHandling:
     """Test error handling across all scripts."""
 
     @pytest.mark.parametrize("script_name", SCRIPTS)
     def test_script_handles_nonexistent_directory(self, script_name: str, tmp_path: Path) -> None:
         """Test that scripts handle nonexistent directories gracefully."""
-        # Map script names to their module names
-        module_mapping = {
-            "check-rhiza-workflow-names": "rhiza_hooks.check_workflow_names",
-            "update-readme-help": "rhiza_hooks.update_readme_help",
-            "check-rhiza-config": "rhiza_hooks.check_rhiza_config",
-            "check-makefile-targets": "rhiza_hooks.check_makefile_targets",
-            "check-python-version-consistency": "rhiza_hooks.check_python_version",
-            "check-template-bundles": "rhiza_hooks.check_template_bundles",
-        }
-
-        module_name = module_mapping[script_name]
+        module_name = SCRIPT_MODULES[script_name]
         nonexistent = tmp_path / "nonexistent"
 
         result = subprocess.run(
-            [sys.executable, "-m", module_name],
+            [*PYTHON, "-m", module_name],
             cwd=nonexistent if nonexistent.exists() else tmp_path,
             capture_output=True,
             text=True,
@@ -440,23 +500,5 @@ class TestScriptErrorHandling:
     @pytest.mark.parametrize("script_name", SCRIPTS)
     def test_script_python_importable(self, script_name: str) -> None:
         """Test that script modules are importable."""
-        # Map script names to their actual module names
-        module_mapping = {
-            "check-rhiza-workflow-names": "check_workflow_names",
-            "update-readme-help": "update_readme_help",
-            "check-rhiza-config": "check_rhiza_config",
-            "check-makefile-targets": "check_makefile_targets",
-            "check-python-version-consistency": "check_python_version",
-            "check-template-bundles": "check_template_bundles",
-        }
-
-        module_name = module_mapping.get(script_name, script_name.replace("-", "_"))
-        module_path = f"rhiza_hooks.{module_name}"
-
-        result = subprocess.run(
-            [sys.executable, "-c", f"import {module_path}"],
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        assert result.returncode == 0, f"Failed to import {module_path}: {result.stderr}"
+        module = importlib.import_module(SCRIPT_MODULES[script_name])
+        assert callable(module.main)
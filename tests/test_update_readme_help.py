@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import runpy
 import subprocess
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 
@@ -21,44 +23,42 @@ class TestGetMakeHelpOutput:
 
     def test_success(self) -> None:
         """Returns stdout on success."""
-        mock_result = MagicMock()
-        mock_result.stdout = "help output"
+        mock_result = SimpleNamespace(stdout=b"help output")
         with patch("rhiza_hooks.update_readme_help.subprocess.run", return_value=mock_result):
             result = get_make_help_output()
             assert result == "help output"
 
-    def test_called_process_error(self, capsys: pytest.CaptureFixture[str]) -> None:
-        """Returns None and prints error on CalledProcessError."""
-        with patch(
-            "rhiza_hooks.update_readme_help.subprocess.run",
-            side_effect=subprocess.CalledProcessError(1, "make"),
-        ):
+    def test_output_decoded_as_utf8(self) -> None:
+        """Output is decoded as UTF-8, replacing undecodable bytes."""
+        mock_result = SimpleNamespace(stdout="café\n".encode() + b"\xff\n")
+        with patch("rhiza_hooks.update_readme_help.subprocess.run", return_value=mock_result):
             result = get_make_help_output()
-            assert result is None
-            captured = capsys.readouterr()
-            assert "Error running 'make help'" in captured.out
+            assert result == "café\n\ufffd\n"
 
-    def test_timeout_expired(self, capsys: pytest.CaptureFixture[str]) -> None:
-        """Returns None and prints error on timeout."""
-        with patch(
-            "rhiza_hooks.update_readme_help.subprocess.run",
-            side_effect=subprocess.TimeoutExpired("make", 30),
-        ):
+    def test_newlines_normalized(self) -> None:
+        """CRLF and lone CR line endings come back as LF, as from a text-mode pipe."""
+        mock_result = SimpleNamespace(stdout=b"one\r\ntwo\rthree\n")
+        with patch("rhiza_hooks.update_readme_help.subprocess.run", return_value=mock_result):
             result = get_make_help_output()
-            assert result is None
-            captured = capsys.readouterr()
-            assert "timed out" in captured.out
-
-    def test_file_not_found(self, capsys: pytest.CaptureFixture[str]) -> None:
-        """Returns None and prints error when make not found."""
-        with patch(
-            "rhiza_hooks.update_readme_help.subprocess.run",
-            side_effect=FileNotFoundError(),
-        ):
+            assert result == "one\ntwo\nthree\n"
+
+    @pytest.mark.parametrize(
+        ("error", "message"),
+        [
+            pytest.param(
+                subprocess.CalledProcessError(1, "make"), "Error running 'make help'", id="called-process-error"
+            ),
+            pytest.param(subprocess.TimeoutExpired("make", 30), "timed out", id="timeout-expired"),
+            pytest.param(FileNotFoundError(), "make' command not found", id="file-not-found"),
+        ],
+    )
+    def test_failure_returns_none(self, error: Exception, message: str, capsys: pytest.CaptureFixture[str]) -> None:
+        """Returns None and prints the matching error when make cannot produce help."""
+        with patch("rhiza_hooks.update_readme_help.subprocess.run", side_effect=error):
             result = get_make_help_output()
             assert result is None
             captured = capsys.readouterr()
-            assert "make' command not found" in captured.out
+            assert message in captured.out
 
 
 class TestFindRepoRoot:
@@ -132,6 +132,46 @@ class TestUpdateReadmeWithHelp:
 
         assert result is False
 
+    def test_no_change_does_not_rewrite_file(self, tmp_path: Path) -> None:
+        """An up-to-date README is never written back."""
+        readme = tmp_path / "README.md"
+        readme.write_text("intro\n<!-- MAKE_HELP_START -->\n```\nsame content\n```\n<!-- MAKE_HELP_END -->\n")
+
+        with patch.object(Path, "write_text") as mock_write:
+            result = update_readme_with_help(readme, "same content\n")
+
+        assert result is False
+        mock_write.assert_not_called()
+
+    def test_end_marker_before_start_returns_false(self, tmp_path: Path) -> None:
+        """An end marker that only precedes the start marker is not a section."""
+        readme = tmp_path / "README.md"
+        original = "<!-- MAKE_HELP_END -->\ntext\n<!-- MAKE_HELP_START -->\n"
+        readme.write_text(original)
+
+        result = update_readme_with_help(readme, "help output\n")
+
+        assert result is False
+        assert readme.read_text() == original
+
+    def test_updates_every_marked_section(self, tmp_path: Path) -> None:
+        """Each pair of markers is replaced, as with the former regex substitution."""
+        readme = tmp_path / "README.md"
+        readme.write_text(
+            "<!-- MAKE_HELP_START -->\none\n<!-- MAKE_HELP_END -->\n"
+            "middle\n"
+            "<!-- MAKE_HELP_START -->\ntwo\n<!-- MAKE_HELP_END -->\n"
+        )
+
+        result = update_readme_with_help(readme, "new\n")
+
+        assert result is True
+        content = readme.read_text()
+        assert content.count("```\nnew\n```") == 2
+        assert "middle" in content
+        assert "one" not in content
+        assert "two" not in content
+
     def test_preserves_surrounding_content(self, tmp_path: Path) -> None:
         """Content before and after markers is preserved."""
         readme = tmp_path / "README.md"
@@ -157,50 +197,31 @@ class TestUpdateReadmeWithHelp:
 class TestMain:
     """Tests for main function."""
 
-    def test_main_no_makefile_returns_zero(self) -> None:
-        """Returns 0 when make help fails (no Makefile)."""
-        with patch("rhiza_hooks.update_readme_help.get_make_help_output", return_value=None):
-            result = main([])
-            assert result == 0
-
-    def test_main_readme_updated_returns_one(self, tmp_path: Path) -> None:
-        """Returns 1 when README was updated."""
-        readme = tmp_path / "README.md"
-        readme.write_text("<!-- MAKE_HELP_START -->\nold\n<!-- MAKE_HELP_END -->")
-        (tmp_path / ".git").mkdir()
-
-        with (
-            patch("rhiza_hooks.update_readme_help.get_make_help_output", return_value="new help\n"),
-            patch("rhiza_hooks.update_readme_help.find_repo_root", return_value=tmp_path),
-        ):
-            result = main([])
-            assert result == 1
-
-    def test_main_readme_unchanged_returns_zero(self, tmp_path: Path) -> None:
-        """Returns 0 when README was not changed."""
-        readme = tmp_path / "README.md"
-        readme.write_text("<!-- MAKE_HELP_START -->\n```\nsame content\n```\n<!-- MAKE_HELP_END -->")
-        (tmp_path / ".git").mkdir()
-
-        with (
-            patch("rhiza_hooks.update_readme_help.get_make_help_output", return_value="same content\n"),
-            patch("rhiza_hooks.update_readme_help.find_repo_root", return_value=tmp_path),
-        ):
-            result = main([])
-            assert result == 0
-
-    def test_main_no_markers_returns_zero(self, tmp_path: Path) -> None:
-        """Returns 0 when README has no markers."""
+    @pytest.mark.parametrize(
+        ("help_output", "readme_text", "expected"),
+        [
+            pytest.param(None, "# Test\n", 0, id="no-makefile"),
+            pytest.param("new help\n", "<!-- MAKE_HELP_START -->\nold\n<!-- MAKE_HELP_END -->", 1, id="readme-updated"),
+            pytest.param(
+                "same content\n",
+                "<!-- MAKE_HELP_START -->\n```\nsame content\n```\n<!-- MAKE_HELP_END -->",
+                0,
+                id="readme-unchanged",
+            ),
+            pytest.param("help output\n", "# Just a readme\n\nNo markers here.", 0, id="no-markers"),
+        ],
+    )
+    def test_main_exit_code(self, tmp_path: Path, help_output: str | None, readme_text: str, expected: int) -> None:
+        """Returns 1 only when the README was rewritten with new help output."""
         readme = tmp_path / "README.md"
-        readme.write_text("# Just a readme\n\nNo markers here.")
-        (tmp_path / ".git").mkdir()
+        readme.write_text(readme_text)
 
         with (
-            patch("rhiza_hooks.update_readme_help.get_make_help_output", return_value="help output\n"),
+            patch("rhiza_hooks.update_readme_help.get_make_help_output", return_value=help_output),
             patch("rhiza_hooks.update_readme_help.find_repo_root", return_value=tmp_path),
         ):
             result = main([])
-            assert result == 0
+            assert result == expected
 
 
 class TestModuleExecution:
@@ -208,8 +229,6 @@ class TestModuleExecution:
 
     def test_module_executes_main(self) -> None:
         """Module execution calls main and exits with its return value."""
-        import runpy
-
         # Patch subprocess.run to raise FileNotFoundError so get_make_help_output returns None
         # This needs to be patched at subprocess level since runpy creates a fresh module namespace
         with (